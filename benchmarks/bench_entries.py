@@ -0,0 +1,99 @@
+"""Per-entry cost of turning selected nodes into entries.
+
+Compares the previous builder, which paired eight document-wide selections by
+position, read the same node's .text several times, parsed every description
+a second time with BeautifulSoup and formatted its log lines eagerly, with the
+current legacy_records + build_entry path. Both start from the same eight
+selections, so only the per-entry work is timed (parsing and selecting are
+not), with INFO logging off as in a quiet production run.
+
+Usage: python benchmarks/bench_entries.py [--repeat N] [--parser BACKEND] [--feed NAME ...]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from urllib.parse import urljoin
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, 'benchmarks', 'fixtures')
+sys.path.insert(0, ROOT)
+
+from feed import feeds  # noqa: E402
+from rssonceaday.extraction import legacy_records, legacy_selections  # noqa: E402
+from rssonceaday.feed_config import load_feed_configs  # noqa: E402
+from rssonceaday.pipeline import build_entry, generate_entry_id  # noqa: E402
+from rssonceaday.html_parsers import parse_html  # noqa: E402
+
+DEFAULT_FEEDS = ("salmo_do_dia", "devocional_de_hoje")
+
+def previous_entries(selections, feed_config):
+    """The entry loop as it was before single-pass extraction, kept here as the baseline."""
+    titles, stitles, urls, descriptions, authors, dates, extras, extras2 = selections.values()
+    logging.info(f"Found {len(titles)} titles: {[t.text.strip() for t in titles[:3]]}")
+    logging.info(f"Found {len(urls)} URLs: {[u.get('href') for u in urls[:3]]}")
+    logging.info(f"Found {len(descriptions)} descriptions: {[d.text.strip()[:50] for d in descriptions[:3]]}")
+    logging.info(f"Found {len(dates)} dates: {[d.text.strip() for d in dates[:3]]}")
+    min_len = min(len(titles), len(urls) or len(titles), len(descriptions) or len(titles),
+                  len(authors) or len(titles), len(dates) or len(titles), len(extras) or len(titles),
+                  len(extras2) or len(titles), len(stitles) or len(titles))
+    entries = []
+    for i in range(min_len):
+        item_url = urljoin(feed_config.url, urls[i].get('href')) if urls else feed_config.url
+        entry_id = generate_entry_id(titles[i].text)
+        logging.info(f"Processing entry {i+1}: Title='{titles[i].text}', ID={entry_id}")
+        description_text = descriptions[i].text if i < len(descriptions) else "No description found"
+        description_text = parse_html(description_text).soup.text.strip()
+        if extras and i < len(extras) and extras[i].text.strip():
+            description_text += f"\n {extras[i].text}"
+        if extras2 and i < len(extras2) and extras2[i].text.strip():
+            description_text += f"\n {extras2[i].text}"
+        entry_data = {
+            "Title": f"{titles[i].text} - {stitles[i].text}" if i < len(stitles) and stitles[i].text.strip() else titles[i].text,
+            "ID": entry_id,
+            "Description": description_text,
+            "Link": item_url
+        }
+        if authors and i < len(authors) and authors[i].text.strip():
+            entry_data["Author"] = authors[i].text
+        entries.append(entry_data)
+    return entries
+
+def current_entries(selections, feed_config):
+    return [build_entry(feed_config, record) for record in legacy_records(selections)]
+
+def per_entry(build, selections, feed_config, repeat):
+    """Best-of-N seconds per entry, and the entries of the last run."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        entries = build(selections, feed_config)
+        best = min(best, time.perf_counter() - start)
+    return best / max(1, len(entries)), entries
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--parser", default="html.parser")
+    parser.add_argument("--feed", action="append", dest="feeds", metavar="NAME",
+                        help=f"output directory name of a feed (default: {', '.join(DEFAULT_FEEDS)})")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    with open(os.path.join(FIXTURES, 'index.json')) as index_file:
+        index = json.load(index_file)
+    print(f"{'feed':<22} {'entries':>7} {'previous us':>12} {'current us':>11} {'speed-up':>9}")
+    for name in args.feeds or DEFAULT_FEEDS:
+        feed_config = next(c for c in load_feed_configs(feeds) if c.name == name)
+        with open(os.path.join(FIXTURES, index[feed_config.url]), encoding='utf-8') as page_file:
+            selections = legacy_selections(parse_html(page_file.read(), args.parser), feed_config)
+        before, expected = per_entry(previous_entries, selections, feed_config, args.repeat)
+        after, entries = per_entry(current_entries, selections, feed_config, args.repeat)
+        same = [{k: v for k, v in e.items() if k != "Published"} for e in entries] == expected
+        print(f"{name:<22} {len(entries):>7} {before * 1e6:>12.1f} {after * 1e6:>11.1f} {before / after:>8.1f}x"
+              + ("" if same else "  (entries differ)"))
+
+if __name__ == "__main__":
+    main()
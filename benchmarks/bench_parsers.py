@@ -0,0 +1,76 @@
+"""Compare HTML parser backends on the saved fixture pages.
+
+For every page in benchmarks/fixtures/index.json this parses the page with each
+available backend and extracts the items of every feed in feed.py that scrapes
+it, reporting the best-of-N time and the number of extracted field values (which
+should agree across backends).
+
+The fixtures are offline reconstructions of the scraped pages: same selector
+structure and comparable size, built from the text already in feeds/*/feed.json.
+
+Usage: python benchmarks/bench_parsers.py [--repeat N]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, 'benchmarks', 'fixtures')
+sys.path.insert(0, ROOT)
+
+from feed import feeds  # noqa: E402
+from rssonceaday.extraction import extract_records  # noqa: E402
+from rssonceaday.feed_config import load_feed_configs  # noqa: E402
+from rssonceaday.html_parsers import available_backends, parse_html  # noqa: E402
+
+def load_fixtures():
+    with open(os.path.join(FIXTURES, 'index.json')) as index_file:
+        index = json.load(index_file)
+    pages = {}
+    for url, filename in index.items():
+        with open(os.path.join(FIXTURES, filename), encoding='utf-8') as page_file:
+            pages[url] = page_file.read()
+    return pages
+
+def configs_for(url):
+    return [feed_config for feed_config in load_feed_configs(feeds) if feed_config.url == url]
+
+def run_once(text, backend, configs):
+    document = parse_html(text, backend)
+    return sum(value is not None for feed_config in configs
+               for record in extract_records(document, feed_config) for value in record.values())
+
+def bench(text, backend, configs, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        matched = run_once(text, backend, configs)
+        best = min(best, time.perf_counter() - start)
+    return best, matched
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    backends = available_backends()
+    pages = load_fixtures()
+    totals = dict.fromkeys(backends, 0.0)
+    print(f"{'page':<45} {'KB':>6} " + " ".join(f"{b + ' ms':>16}" for b in backends))
+    for url, text in pages.items():
+        configs = configs_for(url)
+        cells = []
+        for backend in backends:
+            seconds, matched = bench(text, backend, configs, args.repeat)
+            totals[backend] += seconds
+            cells.append(f"{seconds * 1000:>9.2f} ({matched:>3})")
+        name = url.split('//', 1)[1][:45]
+        print(f"{name:<45} {len(text.encode('utf-8')) / 1024:>6.0f} " + " ".join(f"{c:>16}" for c in cells))
+    baseline = totals[backends[0]]
+    print(f"{'total':<52} " + " ".join(
+        f"{totals[b] * 1000:>9.2f} x{baseline / totals[b]:<5.1f}" for b in backends))
+
+if __name__ == "__main__":
+    main()
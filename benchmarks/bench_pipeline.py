@@ -0,0 +1,227 @@
+"""Offline throughput benchmark for the whole generate_feeds pipeline.
+
+The recorded pages in benchmarks/fixtures (see index.json) are served from a
+local HTTP server, and every config in feed.py is pointed at it. Each scenario
+runs generate_feeds over a synthetic catalogue in a fresh subprocess, so peak
+RSS is per scenario. It reports feeds/sec, p50/p95 per-feed latency (page fetch
+and parse plus the feed's own stages) and peak RSS. With --processes N pages
+are parsed and built in N worker processes; peak RSS is then the parent's only.
+
+Scenarios: a feed-count sweep at the recorded page sizes, plus a page-size sweep
+where every page is padded (or stripped of header/footer boilerplate) to the
+target size.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--feeds 1,100,1000] [--sizes 10k,100k,1m,5m]
+                                        [--size-sweep-feeds 10] [--workers 4] [--processes 1]
+                                        [--parser html.parser]
+    python benchmarks/bench_pipeline.py --record   # refresh the fixtures from the live sites
+"""
+import argparse
+import dataclasses
+import functools
+import http.server
+import json
+import logging
+import os
+import re
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, 'benchmarks', 'fixtures')
+sys.path.insert(0, ROOT)
+
+from feed import feeds  # noqa: E402
+from rssonceaday.feed_config import load_feed_configs  # noqa: E402
+
+_BOILERPLATE = re.compile(r'<(header|footer)>.*?</\1>', re.S)
+_FILLER = ('<div class="bench-filler"><p>Lorem ipsum dolor sit amet, consectetur adipiscing elit, '
+           'sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.</p>'
+           '<a href="/bench/link">Ver mais</a></div>\n')
+
+def parse_size(text):
+    text = text.strip().lower()
+    if text == 'native':
+        return None
+    units = {'k': 1024, 'm': 1024 * 1024}
+    return int(float(text[:-1]) * units[text[-1]]) if text[-1] in units else int(text)
+
+def load_index():
+    with open(os.path.join(FIXTURES, 'index.json')) as index_file:
+        return json.load(index_file)
+
+def load_fixture(filename):
+    with open(os.path.join(FIXTURES, filename), encoding='utf-8') as page_file:
+        return page_file.read()
+
+def resize_page(page, target):
+    """Pad page with filler (or drop header/footer boilerplate) to roughly target bytes."""
+    if target is None:
+        return page
+    if len(page.encode('utf-8')) > target:
+        page = _BOILERPLATE.sub('', page)
+    missing = target - len(page.encode('utf-8'))
+    if missing <= 0:
+        return page
+    filler = _FILLER * (missing // len(_FILLER) + 1)
+    if '</body>' in page:
+        return page.replace('</body>', filler[:missing] + '</body>', 1)
+    return page + filler[:missing]
+
+class FixtureServer:
+    """Serves /page/<i> from an in-memory list of pages on a random local port."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        handler = functools.partial(_FixtureHandler, pages)
+        self.httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+class _FixtureHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def __init__(self, pages, *args, **kwargs):
+        self.pages = pages
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        try:
+            body = self.pages[int(self.path.rsplit('/', 1)[1])]
+        except (ValueError, IndexError):
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def build_catalogue(feed_count, size, base_url, output_root):
+    """Clone the feed.py configs round-robin into feed_count feeds with distinct local URLs."""
+    index = load_index()
+    usable = [feed_config for feed_config in load_feed_configs(feeds) if feed_config.url in index]
+    fixture_pages = {url: resize_page(load_fixture(filename), size).encode('utf-8')
+                     for url, filename in index.items()}
+    pages, configs = [], []
+    for i in range(feed_count):
+        template = usable[i % len(usable)]
+        pages.append(fixture_pages[template.url])
+        configs.append(dataclasses.replace(template, url=f"{base_url}/page/{i}",
+                                           output_path=os.path.join(output_root, f"feed_{i:05d}")))
+    return pages, configs
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def run_scenario(feed_count, size, workers, parser, processes=1):
+    from rssonceaday import run_report
+    from rssonceaday.pipeline import generate_feeds
+
+    output_root = tempfile.mkdtemp(prefix='rssonceaday-bench-')
+    try:
+        pages = []
+        with FixtureServer(pages) as server:
+            catalogue_pages, configs = build_catalogue(feed_count, size, server.base_url, output_root)
+            pages.extend(catalogue_pages)
+            report = run_report.start_report()
+            started = time.perf_counter()
+            generate_feeds(configs, max_workers=workers, force=True, default_parser=parser, processes=processes)
+            elapsed = time.perf_counter() - started
+            run_report.stop_report()
+    finally:
+        shutil.rmtree(output_root, ignore_errors=True)
+
+    records = report.as_dict()["records"]
+    latencies = [records.get(config.url, {}).get("total", 0.0) + records.get(config.output_path, {}).get("total", 0.0)
+                 for config in configs]
+    return {
+        "feeds": feed_count,
+        "page_bytes": int(statistics.mean(len(page) for page in pages)),
+        "seconds": elapsed,
+        "feeds_per_sec": feed_count / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "built": sum(1 for config in configs if records.get(config.output_path, {}).get("status") == "built"),
+    }
+
+def record_fixtures():
+    """Download every distinct feed.py URL and save it as a fixture."""
+    import requests
+
+    index = load_index()
+    for url in dict.fromkeys(feed_config["url"] for feed_config in feeds):
+        filename = index.get(url) or re.sub(r'[^A-Za-z0-9]+', '_', url.split('//', 1)[-1]).strip('_') + '.html'
+        try:
+            r = requests.get(url, timeout=30)
+            r.raise_for_status()
+        except requests.RequestException as e:
+            print(f"skipped {url}: {e}")
+            continue
+        with open(os.path.join(FIXTURES, filename), 'w', encoding='utf-8') as page_file:
+            page_file.write(r.text)
+        index[url] = filename
+        print(f"recorded {url} -> {filename} ({len(r.content) // 1024} KB)")
+    with open(os.path.join(FIXTURES, 'index.json'), 'w') as index_file:
+        json.dump(index, index_file, indent=4, ensure_ascii=False)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--feeds", default="1,100,1000", help="feed counts for the feed-count sweep")
+    parser.add_argument("--sizes", default="10k,100k,1m,5m", help="page sizes for the page-size sweep")
+    parser.add_argument("--size-sweep-feeds", type=int, default=10, help="feeds per page-size scenario")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--parser", default="html.parser")
+    parser.add_argument("--record", action="store_true", help="refresh the fixtures from the live sites and exit")
+    parser.add_argument("--scenario", nargs=2, metavar=("FEEDS", "SIZE"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.record:
+        record_fixtures()
+        return
+    logging.basicConfig(level=logging.WARNING)
+    if args.scenario:
+        feed_count, size = args.scenario
+        print(json.dumps(run_scenario(int(feed_count), parse_size(size), args.workers, args.parser,
+                                      args.processes)))
+        return
+
+    scenarios = [(int(n), 'native') for n in args.feeds.split(',') if n]
+    scenarios += [(args.size_sweep_feeds, size) for size in args.sizes.split(',') if size]
+    print(f"{'feeds':>6} {'page KB':>8} {'feeds/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'peak RSS MB':>12} {'built':>6}")
+    for feed_count, size in scenarios:
+        # A fresh interpreter per scenario keeps peak RSS independent of earlier scenarios
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), "--scenario", str(feed_count), size,
+                                 "--workers", str(args.workers), "--processes", str(args.processes),
+                                 "--parser", args.parser],
+                                check=True, capture_output=True, text=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{result['feeds']:>6} {result['page_bytes'] / 1024:>8.0f} {result['feeds_per_sec']:>9.1f} "
+              f"{result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {result['peak_rss_mb']:>12.1f} {result['built']:>6}")
+
+if __name__ == "__main__":
+    main()
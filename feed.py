@@ -7,17 +7,19 @@ feeds = [
         "author_email": " ",
         "copyright": "Dicio",
         "language": "pt-BR",  # Changed from "pt"
-        "item_title_css": ".word-of-day .title",
-        "item_stitle_css": ".word-of-day--subtitle",
-        "item_url_css": ".word-of-day--subtitle a",
-        "item_author_css": "",  # Changed from None
-        "item_description_css": ".word-of-day--text-wrap .word-of-day--description, .word-of-day--extra",
-        "item_extra_css": ".word-of-day--extra",
-        "item_extra_css2": "",  # Changed from None
-        "item_date_css": ".word-of-day .title",
+        "item_css": ".word-of-day",  # One item per word; the fields below are selected inside it
+        "fields": {
+            "title": ".title",
+            "subtitle": ".word-of-day--subtitle",
+            "link": ".word-of-day--subtitle a",
+            "description": ".word-of-day--description",
+            "extras": {"css": ".word-of-day--extra", "all": True},
+            "date": ".title",
+        },
         "item_date_format": "%d/%m/%Y",
         "item_timezone": "America/Sao_Paulo",
         "output_path": "feeds/palavra_do_dia",
+        "refresh_interval": "1d",  # Changes once a day; checked daily in --daemon mode
         "formats": ["xml", "json"]
     },
     {
@@ -39,6 +41,7 @@ feeds = [
         "item_date_format": "%Y-%m-%d",
         "item_timezone": "UTC",
         "output_path": "feeds/example_feed",
+        "refresh_interval": "7d",  # Static page; checked weekly in --daemon mode
         "formats": ["xml", "json"]
     },
     {
@@ -60,6 +63,7 @@ feeds = [
         "item_date_format": "%d de %B de %Y",
         "item_timezone": "GMT-3",
         "output_path": "feeds/versículo_do_dia",
+        "refresh_interval": "1d",  # Changes once a day; checked daily in --daemon mode
         "formats": ["xml", "json"]
     },
     {
@@ -81,12 +85,14 @@ feeds = [
         "item_date_format": "%A, %d de %B de %Y",
         "item_timezone": "GMT-3",
         "output_path": "feeds/salmo_do_dia",
+        "refresh_interval": "1d",  # Changes once a day; checked daily in --daemon mode
         "formats": ["xml", "json"]
     },
     {
         "title": "Palavra Biblica do Dia",
         "url": "https://www.bibliaon.com/palavra_do_dia/",
         "output_path": "feeds/palavra_biblica_do_dia",
+        "refresh_interval": "1d",  # Changes once a day; checked daily in --daemon mode
         "subtitle": "Inspiração diária da Palavra de Deus",
         "language": "pt-BR",  # Already "pt-BR", kept as is
         "author_name": "BíbliaOn",
@@ -122,12 +128,14 @@ feeds = [
         "item_date_format": "%A, %d de %B de %Y",
         "item_timezone": "GMT-3",
         "output_path": "feeds/devocional_de_hoje",
+        "refresh_interval": "1d",  # Changes once a day; checked daily in --daemon mode
         "formats": ["xml", "json"]
     },
 # Wikipedia Feeds with corrected selectors
     {
         "url": "https://pt.wikipedia.org/wiki/Wikipédia:Página_principal",
         "output_path": "feeds/wikidestaque",
+        "refresh_interval": "1d",  # Changes once a day; checked daily in --daemon mode
         "title": "Wikipédia em Português - Artigo em Destaque",
         "subtitle": "Artigo em destaque da Wikipédia em português",
         "language": "pt-BR",
@@ -148,6 +156,7 @@ feeds = [
     {
         "url": "https://pt.wikipedia.org/wiki/Wikipédia:Página_principal",
         "output_path": "feeds/wikidia",
+        "refresh_interval": "1d",  # Changes once a day; checked daily in --daemon mode
         "title": "Wikipédia em Português - Efemérides",
         "subtitle": "Efemérides diárias da Wikipédia em português",
         "language": "pt-BR",
@@ -168,6 +177,9 @@ feeds = [
     {
         "url": "https://pt.wikipedia.org/wiki/Wikipédia:Página_principal",
         "output_path": "feeds/wikiimagem",
+        "refresh_interval": "1d",  # Changes once a day; checked daily in --daemon mode
+        "enclosure_css": "div.main-page-third-row div .main-page-block-contents img",  # Picture of the day, attached to each entry
+        "probe_enclosures": True,  # Look up the image's real type and size (cached for a week)
         "title": "Wikipédia em Português - Imagem do Dia",
         "subtitle": "Imagem do dia da Wikipédia em português",
         "language": "pt-BR",
@@ -0,0 +1,33 @@
+"""Turn daily web pages into Atom/RSS/JSON feeds by CSS selectors.
+
+    from rssonceaday import generate, generate_feeds, load_catalogue
+
+    results = generate_feeds(load_catalogue("feed.py"))
+
+The names below are imported on first use, so importing the package stays
+cheap. The pipeline and the CLI (main) are in rssonceaday.pipeline.
+"""
+from importlib import import_module
+
+_EXPORTS = {
+    "generate": "pipeline",
+    "generate_feeds": "pipeline",
+    "main": "pipeline",
+    "ConfigError": "feed_config",
+    "FeedConfig": "feed_config",
+    "load_catalogue": "feed_config",
+    "load_feed_configs": "feed_config",
+}
+
+__all__ = sorted(_EXPORTS)
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
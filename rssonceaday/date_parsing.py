@@ -0,0 +1,119 @@
+"""Parse the item dates scraped by item_date_css into UTC timestamps.
+
+"item_date_format" uses strptime directives, but is compiled to a regular
+expression that is searched for anywhere in the text, so "Palavra de Hoje
+(22/08/2026)" matches "%d/%m/%Y". %B/%b and %A/%a accept Portuguese and English
+names, with or without accents. "item_timezone" is an IANA name
+("America/Sao_Paulo"), "UTC", or a fixed offset such as "GMT-3" or "UTC+05:30".
+Compiled formats and timezones are cached for the life of the process.
+"""
+import logging
+import re
+import unicodedata
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+MONTHS = {
+    "janeiro": 1, "fevereiro": 2, "marco": 3, "abril": 4, "maio": 5, "junho": 6,
+    "julho": 7, "agosto": 8, "setembro": 9, "outubro": 10, "novembro": 11, "dezembro": 12,
+    "january": 1, "february": 2, "march": 3, "april": 4, "may": 5, "june": 6,
+    "july": 7, "august": 8, "september": 9, "october": 10, "november": 11, "december": 12,
+}
+MONTH_ABBREVIATIONS = {name[:3]: month for name, month in MONTHS.items()}
+WEEKDAYS = ("segunda-feira", "terca-feira", "quarta-feira", "quinta-feira", "sexta-feira", "sabado", "domingo",
+            "segunda", "terca", "quarta", "quinta", "sexta",
+            "monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+WEEKDAY_ABBREVIATIONS = ("seg", "ter", "qua", "qui", "sex", "sab", "dom",
+                         "mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+def _names(names):
+    # Longest first, so "segunda-feira" wins over "segunda"
+    return "|".join(re.escape(name) for name in sorted(set(names), key=len, reverse=True))
+
+_DIRECTIVES = {
+    "d": ("day", r"\d{1,2}"),
+    "m": ("month", r"\d{1,2}"),
+    "Y": ("year", r"\d{4}"),
+    "y": ("short_year", r"\d{2}"),
+    "H": ("hour", r"\d{1,2}"),
+    "M": ("minute", r"\d{2}"),
+    "S": ("second", r"\d{2}"),
+    "B": ("month_name", _names(MONTHS)),
+    "b": ("month_abbreviation", _names(MONTH_ABBREVIATIONS)),
+    "A": (None, _names(WEEKDAYS)),
+    "a": (None, _names(WEEKDAY_ABBREVIATIONS)),
+}
+
+# Optional ordinal after the day: "1º de março" ("º" folds to "o"), "1° de março", "1st March"
+_DAY_SUFFIX = r"(?:o|°|st|nd|rd|th)?"
+
+_OFFSET = re.compile(r"^(?:UTC|GMT)?([+-])(\d{1,2})(?::?(\d{2}))?$", re.I)
+
+def fold(text):
+    """Lower-case text without accents, so "Março" and "marco" compare equal."""
+    return "".join(c for c in unicodedata.normalize("NFKD", text.lower()) if not unicodedata.combining(c))
+
+@lru_cache(maxsize=None)
+def compile_format(fmt):
+    """The regular expression equivalent to a strptime format, matched against folded text."""
+    pattern = []
+    i = 0
+    while i < len(fmt):
+        char = fmt[i]
+        if char == "%" and i + 1 < len(fmt):
+            directive = fmt[i + 1]
+            i += 2
+            if directive == "%":
+                pattern.append("%")
+            elif directive in _DIRECTIVES:
+                name, regex = _DIRECTIVES[directive]
+                pattern.append(f"(?P<{name}>{regex})" if name else f"(?:{regex})")
+                if directive == "d":
+                    pattern.append(_DAY_SUFFIX)
+            else:
+                raise ValueError(f"Unsupported date directive %{directive} in '{fmt}'")
+            continue
+        pattern.append(r"\s+" if char.isspace() else re.escape(fold(char)))
+        i += 1
+    return re.compile("".join(pattern))
+
+@lru_cache(maxsize=None)
+def get_timezone(name):
+    """A tzinfo for "UTC", "GMT-3", "UTC+05:30" or an IANA name; UTC if empty or unknown."""
+    name = (name or "").strip()
+    if not name or name.upper() in ("UTC", "GMT", "Z"):
+        return timezone.utc
+    offset = _OFFSET.match(name)
+    if offset:
+        sign, hours, minutes = offset.groups()
+        delta = timedelta(hours=int(hours), minutes=int(minutes or 0))
+        return timezone(-delta if sign == "-" else delta, name)
+    try:
+        from zoneinfo import ZoneInfo
+
+        return ZoneInfo(name)
+    except (KeyError, ValueError, OSError) as e:  # ZoneInfoNotFoundError is a KeyError
+        logging.warning(f"Unknown timezone '{name}', using UTC: {e}")
+        return timezone.utc
+
+def parse_date(text, fmt, tz_name=None):
+    """The first date in text matching fmt as an aware datetime in tz_name, or None."""
+    if not text or not fmt:
+        return None
+    match = compile_format(fmt).search(fold(text))
+    if match is None:
+        return None
+    fields = match.groupdict()
+    if fields.get("month_name"):
+        month = MONTHS[fields["month_name"]]
+    elif fields.get("month_abbreviation"):
+        month = MONTH_ABBREVIATIONS[fields["month_abbreviation"]]
+    else:
+        month = int(fields.get("month") or 1)
+    year = int(fields["year"]) if fields.get("year") else 2000 + int(fields.get("short_year") or 0)
+    try:
+        return datetime(year, month, int(fields.get("day") or 1), int(fields.get("hour") or 0),
+                        int(fields.get("minute") or 0), int(fields.get("second") or 0),
+                        tzinfo=get_timezone(tz_name))
+    except ValueError:
+        return None
@@ -0,0 +1,82 @@
+"""Resolve the MIME type and byte length of entry enclosures (the "Image" URLs).
+
+Feeds with "probe_enclosures": True get a HEAD request for each enclosure URL
+in their history, sent concurrently through the shared HTTP session. Results
+are kept in the feed's feed_cache.json under "enclosures", keyed by URL, and
+reused until they are "enclosure_ttl" old (default seven days), so the same
+image is not probed again on every run. URLs that leave the history are
+dropped from the cache.
+
+Enclosures that were never probed fall back to a type guessed from the URL
+and an unknown length, which RSS writes as 0 and Atom omits.
+"""
+import logging
+import mimetypes
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .http_client import get_session, head
+
+DEFAULT_ENCLOSURE_TTL = "7d"
+PROBE_WORKERS = 4
+PROBE_TIMEOUT = (5, 15)
+# The length must be that of the file itself, not of a compressed transfer
+PROBE_HEADERS = {"Accept-Encoding": "identity"}
+FALLBACK_TYPE = "image/jpeg"  # enclosures are entry images
+
+def guess_type(url):
+    return mimetypes.guess_type(url.split('?', 1)[0])[0] or FALLBACK_TYPE
+
+def enclosure_info(url, enclosures=None):
+    """{"type", "length"} for url from the probed enclosures, or a guess with length None."""
+    known = (enclosures or {}).get(url)
+    if known:
+        return {"type": known.get("type") or guess_type(url), "length": known.get("length")}
+    return {"type": guess_type(url), "length": None}
+
+def _metadata(r):
+    content_type = r.headers.get("Content-Type", "").split(';', 1)[0].strip()
+    length = r.headers.get("Content-Length")
+    return content_type or None, int(length) if length and length.isdigit() else None
+
+def probe(url, timeout=PROBE_TIMEOUT):
+    """(type, length) from a HEAD request, or from the headers of a streamed GET if HEAD is refused."""
+    import requests
+
+    try:
+        r = head(url, headers=PROBE_HEADERS, timeout=timeout)
+        if r.status_code < 400:
+            return _metadata(r)
+        # Some servers refuse HEAD; the headers of a GET are enough, the body is never read
+        r = get_session().get(url, headers=PROBE_HEADERS, timeout=timeout, stream=True)
+        try:
+            if r.status_code < 400:
+                return _metadata(r)
+        finally:
+            r.close()
+        logging.warning(f"Enclosure probe of {url} failed: status {r.status_code}")
+    except requests.RequestException as e:
+        logging.warning(f"Enclosure probe of {url} failed: {e}")
+    return None
+
+def resolve_enclosures(urls, enclosures, ttl, now=None, max_workers=PROBE_WORKERS):
+    """Probe the urls missing from enclosures or older than ttl seconds, concurrently.
+
+    enclosures ({url: {"type", "length", "checked"}}) is updated in place and
+    pruned to urls. Returns the number of URLs probed.
+    """
+    now = time.time() if now is None else now
+    urls = list(dict.fromkeys(urls))
+    for url in set(enclosures) - set(urls):
+        del enclosures[url]
+    stale = [url for url in urls if now - enclosures.get(url, {}).get("checked", float('-inf')) >= ttl]
+    if not stale:
+        return 0
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(stale))) as executor:
+        for url, metadata in zip(stale, executor.map(probe, stale)):
+            if metadata is None:
+                continue  # keep any older result and try again next run
+            content_type, length = metadata
+            enclosures[url] = {"type": content_type, "length": length, "checked": int(now)}
+            logging.info(f"Enclosure {url}: {content_type}, {length if length is not None else 'unknown'} bytes")
+    return len(stale)
@@ -0,0 +1,101 @@
+"""Per-feed entry history kept in feeds/<name>/feed_cache.json under "entries".
+
+The store is a dict keyed by generate_entry_id, in insertion order from the
+oldest to the newest entry, so dedup is a dict lookup and eviction only ever
+touches the oldest end. Each stored entry is the JSON output record plus a
+"first_seen" UTC timestamp and an "updated" one, which moves only when the
+entry's content changes (feeds with a fixed title such as "Imagem do dia" keep
+one ID and change its content every day).
+"""
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+DEFAULT_MAX_ENTRIES = 100
+DEFAULT_MAX_AGE_DAYS = None  # keep entries regardless of age
+
+FIRST_SEEN = "first_seen"
+UPDATED = "updated"
+BOOKKEEPING = (FIRST_SEEN, UPDATED)
+
+def utc_timestamp(moment=None):
+    return (moment or datetime.now(timezone.utc)).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def seed_from_json(json_file_path, now=None):
+    """Build a store from an existing feed.json, for feeds that predate the store."""
+    try:
+        with open(json_file_path) as json_file:
+            existing = json.load(json_file)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(existing, list):
+        return {}
+    seen = utc_timestamp(now)
+    store = {}
+    for entry in reversed(existing):  # feed.json lists the newest entry first
+        if isinstance(entry, dict) and entry.get("ID"):
+            store[entry["ID"]] = dict(entry, **{FIRST_SEEN: seen, UPDATED: seen})
+    return store
+
+def merge_entries(store, page_entries, now=None):
+    """Add or refresh the entries found on the page; returns the number of new ones.
+
+    page_entries are in page order (newest first), so new ones are inserted in
+    reverse to keep the store ordered oldest to newest. Known entries keep their
+    position and first_seen but take the latest field values; their updated
+    timestamp moves to now only if those values differ from the stored ones.
+    """
+    seen = utc_timestamp(now)
+    added = 0
+    for entry in reversed(page_entries):
+        entry_id = entry["ID"]
+        previous = store.get(entry_id)
+        if previous is None:
+            store[entry_id] = dict(entry, **{FIRST_SEEN: seen, UPDATED: seen})
+            added += 1
+        else:
+            first_seen = previous.get(FIRST_SEEN, seen)
+            updated = (entry_updated(previous) or seen) if output_record(previous) == entry else seen
+            store[entry_id] = dict(entry, **{FIRST_SEEN: first_seen, UPDATED: updated})
+    return added
+
+def evict_entries(store, max_entries=DEFAULT_MAX_ENTRIES, max_age_days=DEFAULT_MAX_AGE_DAYS, now=None):
+    """Drop the oldest entries beyond max_entries or older than max_age_days."""
+    evicted = 0
+    if max_age_days is not None:
+        cutoff = utc_timestamp((now or datetime.now(timezone.utc)) - timedelta(days=max_age_days))
+        while store:
+            oldest_id = next(iter(store))
+            if store[oldest_id].get(FIRST_SEEN, cutoff) >= cutoff:
+                break
+            del store[oldest_id]
+            evicted += 1
+    if max_entries is not None:
+        while len(store) > max_entries:
+            del store[next(iter(store))]
+            evicted += 1
+    return evicted
+
+def output_record(entry):
+    """The JSON output record for a stored entry, without bookkeeping fields."""
+    return {key: value for key, value in entry.items() if key not in BOOKKEEPING}
+
+def entry_updated(entry):
+    """When a stored entry last changed; first_seen for entries stored before "updated" existed."""
+    return entry.get(UPDATED) or entry.get(FIRST_SEEN)
+
+def feed_updated(store):
+    """The latest entry_updated in the store, or None if it is empty."""
+    return max(filter(None, map(entry_updated, store.values())), default=None)
+
+def newest_first(store):
+    """Iterate the stored entries (including first_seen) from the newest."""
+    return reversed(store.values())
+
+def load_store(cache, json_file_path):
+    store = cache.get("entries")
+    if isinstance(store, dict):
+        return store
+    if os.path.exists(json_file_path):
+        return seed_from_json(json_file_path)
+    return {}
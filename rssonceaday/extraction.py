@@ -0,0 +1,115 @@
+"""Turn a parsed page into one record of field values per feed item.
+
+A config with an "item_css" selector is item-scoped: every element matching
+it is one item, and each entry of its "fields" mapping is selected relative
+to that element, so the fields of an item can never pair with another item's.
+
+    "item_css": ".word-of-day",
+    "fields": {
+        "title": ".title",
+        "link": ".word-of-day--subtitle a",
+        "description": ".word-of-day--description",
+        "synonyms": {"css": ".word-of-day--extra", "all": True},
+    }
+
+A field is a selector string or a dict with "css" (empty selects the item
+itself), "attr" (read an attribute instead of the text; "link" defaults to
+"href" and "image" to "src") and "all" (join every match instead of taking the
+first). "title", "subtitle", "link", "description", "author", "date" and
+"image" have fixed meanings; any other field is appended to the description
+in the order it is declared.
+
+Configs without "item_css" keep the legacy item_*_css keys, which select whole
+document lists paired by position.
+"""
+import logging
+from typing import NamedTuple, Optional
+
+from .html_parsers import select_from, select_one_from
+from .run_report import stage
+
+ENTRY_FIELDS = ("title", "subtitle", "link", "description", "author", "date", "image")
+DEFAULT_ATTRS = {"link": "href", "image": "src"}
+
+# Legacy selector keys and the fields they fill, in description order for the extras
+LEGACY_FIELDS = {
+    "item_title_css": "title",
+    "item_stitle_css": "subtitle",
+    "item_url_css": "link",
+    "item_description_css": "description",
+    "item_author_css": "author",
+    "item_date_css": "date",
+    "item_extra_css": "extra",
+    "item_extra_css2": "extra2",
+}
+
+class FieldSpec(NamedTuple):
+    """A normalised field: selector relative to the item, attribute to read (None for text), join all matches."""
+    css: str
+    attr: Optional[str]
+    all: bool
+
+def field_spec(name, spec):
+    """Normalise a field (a selector string or a dict) to a FieldSpec."""
+    if isinstance(spec, str):
+        spec = {"css": spec}
+    # An unset key and a blank one (e.g. a bare "css:" in YAML) both mean the default
+    return FieldSpec((spec.get("css") or "").strip(), spec.get("attr") or DEFAULT_ATTRS.get(name),
+                     bool(spec.get("all", False)))
+
+def _value(node, attr):
+    return node.get(attr) if attr else node.text
+
+def _extract_field(item, spec):
+    if not spec.css:
+        return _value(item, spec.attr)
+    if spec.all:
+        values = [_value(node, spec.attr) for node in select_from(item, spec.css)]
+        values = [value for value in values if value]
+        return "\n ".join(values) if values else None
+    node = select_one_from(item, spec.css)
+    return _value(node, spec.attr) if node is not None else None
+
+def extract_items(document, feed_config):
+    """One {field: value or None} record per item container, in page order."""
+    specs = feed_config.fields  # (name, FieldSpec) pairs, normalised when the config was loaded
+    with stage(feed_config.output_path, "extract"):
+        items = document.select(feed_config.item_css)
+        records = [{name: _extract_field(item, spec) for name, spec in specs} for item in items]
+    skipped = sum(1 for record in records if not record["title"])
+    if skipped:
+        logging.info(f"Skipping {skipped} of {len(records)} items without a title")
+    return [record for record in records if record["title"]]
+
+def _select(document, feed_config, field, css):
+    """Run one legacy selector, timing it as a select:<field> stage; [] if unset."""
+    if not css:
+        return []
+    with stage(feed_config.output_path, f"select:{field}"):
+        return document.select(css)
+
+def legacy_selections(document, feed_config):
+    """{field: matched nodes} for every legacy selector key."""
+    selectors = dict(feed_config.legacy_fields)
+    return {field: _select(document, feed_config, field, selectors.get(field)) for field in LEGACY_FIELDS.values()}
+
+def legacy_records(selections):
+    """Records from the legacy parallel lists, paired by position up to the shortest non-empty list."""
+    titles = selections["title"]
+    min_len = min([len(nodes) for nodes in selections.values() if nodes] or [0]) if titles else 0
+    logging.info("Min length for iteration: %d", min_len)
+    urls = selections["link"]
+    records = []
+    for i in range(min_len):
+        # Each node's text is read exactly once; the link node only contributes its href
+        record = {field: (nodes[i].text if nodes else None) if field != "link" else None
+                  for field, nodes in selections.items()}
+        record["link"] = urls[i].get('href') if urls else None
+        records.append(record)
+    return records
+
+def extract_records(document, feed_config):
+    """Item records for a feed, item-scoped if it declares item_css, legacy otherwise."""
+    if feed_config.item_css:
+        return extract_items(document, feed_config)
+    return legacy_records(legacy_selections(document, feed_config))
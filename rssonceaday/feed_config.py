@@ -0,0 +1,305 @@
+"""Typed feed configs, validated and normalised once when the catalogue is loaded.
+
+load_feed_configs() turns the dicts of feed.py (or of a YAML/JSON catalogue)
+into frozen, hashable FeedConfig objects. Every option gets its default up front and ""
+and None both mean "not set", so the rest of the code reads attributes instead
+of re-checking keys on every run. All problems in a catalogue are reported
+together as one ConfigError.
+
+load_catalogue(path) reads a .json, .yaml or .yml file holding a list of feed
+dicts (or {"feeds": [...]}), or a .py file defining such a list as "feeds"
+(the CLI's default is ./feed.py). The validated catalogue is pickled under
+__pycache__/ next to the file and reused while the file is unchanged.
+"""
+import dataclasses
+import json
+import logging
+import os
+import pickle
+from dataclasses import dataclass
+from importlib.util import find_spec, module_from_spec, spec_from_file_location
+from typing import Optional
+
+from .date_parsing import compile_format
+from .enclosures import DEFAULT_ENCLOSURE_TTL
+from .entry_store import DEFAULT_MAX_AGE_DAYS, DEFAULT_MAX_ENTRIES
+from .extraction import LEGACY_FIELDS, field_spec
+from .feed_writers import COMPRESSED_FORMATS, DEFAULT_FORMATS, FORMAT_FILES
+from .html_parsers import PARSER_BACKENDS
+from .http_client import DEFAULT_RETRIES, DEFAULT_RETRY_BACKOFF, DEFAULT_TIMEOUT
+from .scheduler import DEFAULT_JITTER, DEFAULT_REFRESH_INTERVAL, parse_interval
+
+YAML_AVAILABLE = find_spec("yaml") is not None
+
+DEFAULT_CATALOGUE = "feed.py"
+
+# Bump when FeedConfig changes, so stale compiled catalogues are rebuilt
+CATALOGUE_VERSION = 3
+
+REQUIRED_KEYS = ("url", "output_path", "title")
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+class ConfigError(ValueError):
+    """One or more feed configs are invalid; the message lists every problem."""
+
+@dataclass(frozen=True, slots=True)
+class FeedConfig:
+    url: str
+    output_path: str
+    title: str
+    subtitle: str = ""
+    author_name: str = ""
+    author_email: str = ""
+    copyright: str = ""
+    language: str = "en"
+    formats: tuple = tuple(DEFAULT_FORMATS)
+    parser: Optional[str] = None
+    # Item-scoped extraction (see extraction.py): container selector and ((field, FieldSpec), ...)
+    item_css: str = ""
+    fields: tuple = ()
+    # Legacy document-wide selectors, ((field, css), ...) for the item_*_css keys that are set
+    legacy_fields: tuple = ()
+    item_date_format: str = ""
+    item_timezone: str = ""
+    # Document-wide selector of an image attached to every entry, and the attribute holding its URL
+    enclosure_css: str = ""
+    enclosure_attr: str = "src"
+    # HEAD-probe the type and length of entry images, caching them for enclosure_ttl seconds
+    probe_enclosures: bool = False
+    enclosure_ttl: float = parse_interval(DEFAULT_ENCLOSURE_TTL)
+    max_entries: Optional[int] = DEFAULT_MAX_ENTRIES
+    max_age_days: Optional[float] = DEFAULT_MAX_AGE_DAYS
+    refresh_interval: float = parse_interval(DEFAULT_REFRESH_INTERVAL)
+    refresh_jitter: float = DEFAULT_JITTER
+    timeout: tuple = DEFAULT_TIMEOUT
+    retries: int = DEFAULT_RETRIES
+    retry_backoff: float = DEFAULT_RETRY_BACKOFF
+    log_level: Optional[str] = None
+
+    @property
+    def name(self):
+        """The output directory name, used by --feed and in logs and results."""
+        return os.path.basename(os.path.normpath(self.output_path))
+
+    def as_dict(self):
+        """The config as plain JSON-ready values, with fields and legacy_fields as mappings."""
+        values = dataclasses.asdict(self)
+        values["fields"] = {name: spec._asdict() for name, spec in self.fields}
+        values["legacy_fields"] = dict(self.legacy_fields)
+        return values
+
+_FIELD_NAMES = frozenset(f.name for f in dataclasses.fields(FeedConfig))
+KNOWN_KEYS = _FIELD_NAMES | frozenset(LEGACY_FIELDS)
+
+def _blank(value):
+    return value is None or value == ""
+
+def _number(value, key, errors, kind=float, minimum=0):
+    try:
+        number = kind(value)
+    except (TypeError, ValueError):
+        errors.append(f"{key} must be a number, not {value!r}")
+        return None
+    if number < minimum:
+        errors.append(f"{key} must be at least {minimum}, not {value!r}")
+    return number
+
+def _field_problem(name, spec):
+    """Why a fields entry is malformed, or None: it must be a selector string or a dict with string css/attr."""
+    if isinstance(spec, str):
+        return None
+    if not isinstance(spec, dict):
+        return f"field {name} must be a selector string or a mapping with css"
+    for key in ("css", "attr"):
+        if spec.get(key) is not None and not isinstance(spec[key], str):
+            return f"field {name} {key} must be a string"
+    return None
+
+def _normalise(raw, errors):
+    """The FeedConfig keyword arguments for one raw dict, appending problems to errors."""
+    values = {}
+    for key in REQUIRED_KEYS:
+        if _blank(raw.get(key)):
+            errors.append(f"missing {key}")
+        elif not isinstance(raw[key], str):
+            errors.append(f"{key} must be a string")
+    for key in ("subtitle", "author_name", "author_email", "copyright", "language", "item_css",
+                "item_date_format", "item_timezone", "enclosure_css", "enclosure_attr", "parser", "log_level"):
+        value = raw.get(key)
+        if _blank(value):
+            continue
+        if not isinstance(value, str):
+            errors.append(f"{key} must be a string")
+            continue
+        values[key] = value.strip() if key.endswith("_css") else value
+    if errors:
+        return None
+    values.update(url=raw["url"], output_path=raw["output_path"], title=raw["title"])
+
+    formats = raw.get("formats")
+    if not _blank(formats):
+        if isinstance(formats, str):
+            formats = [formats]
+        if not isinstance(formats, (list, tuple)) or not all(isinstance(name, str) for name in formats):
+            errors.append("formats must be a format name or a list of names")
+            formats = ()
+        unknown = [name for name in formats if name not in FORMAT_FILES and name not in COMPRESSED_FORMATS]
+        if unknown:
+            errors.append(f"unknown formats {unknown}")
+        values["formats"] = tuple(formats)
+
+    fields = raw.get("fields")
+    if values.get("item_css"):
+        if not isinstance(fields, dict) or "title" not in fields:
+            errors.append("item_css needs a fields mapping with a title")
+        else:
+            problems = [problem for problem in (_field_problem(name, spec) for name, spec in fields.items())
+                        if problem]
+            errors.extend(problems)
+            if not problems:
+                values["fields"] = tuple((name, field_spec(name, spec)) for name, spec in fields.items())
+    elif fields:
+        errors.append("fields is set but item_css is not")
+    legacy_fields = []
+    for key, name in LEGACY_FIELDS.items():
+        if _blank(raw.get(key)):
+            continue
+        if not isinstance(raw[key], str):
+            errors.append(f"{key} must be a string")
+            continue
+        legacy_fields.append((name, raw[key].strip()))
+    values["legacy_fields"] = tuple(legacy_fields)
+    if not values.get("item_css") and _blank(raw.get("item_title_css")):
+        errors.append("needs item_css or item_title_css")
+
+    if values.get("item_date_format"):
+        try:
+            compile_format(values["item_date_format"])
+        except ValueError as e:
+            errors.append(str(e))
+    if values.get("parser") and values["parser"] not in PARSER_BACKENDS:
+        errors.append(f"parser must be one of {', '.join(PARSER_BACKENDS)}")
+    if values.get("log_level") and values["log_level"].upper() not in LOG_LEVELS:
+        errors.append(f"log_level must be one of {', '.join(LOG_LEVELS)}")
+
+    for key, kind in (("max_entries", int), ("max_age_days", float)):
+        if key in raw:
+            values[key] = None if raw[key] is None else _number(raw[key], key, errors, kind)
+    for key, kind in (("refresh_jitter", float), ("retries", int), ("retry_backoff", float)):
+        if not _blank(raw.get(key)):
+            values[key] = _number(raw[key], key, errors, kind)
+    if values.get("refresh_jitter") is not None and values["refresh_jitter"] >= 1:
+        errors.append(f"refresh_jitter must be below 1, not {raw['refresh_jitter']!r}")  # else delays can reach 0
+    for key in ("refresh_interval", "enclosure_ttl"):
+        if not _blank(raw.get(key)):
+            try:
+                seconds = parse_interval(raw[key])
+            except ValueError:
+                errors.append(f"{key} must be seconds or e.g. '30m', '1d', not {raw[key]!r}")
+                continue
+            if not seconds > 0:  # also rejects NaN; 0 would re-run the feed in a tight loop
+                errors.append(f"{key} must be greater than 0, not {raw[key]!r}")
+            values[key] = seconds
+    if not _blank(raw.get("probe_enclosures")):
+        if not isinstance(raw["probe_enclosures"], bool):
+            errors.append("probe_enclosures must be true or false")
+        values["probe_enclosures"] = bool(raw["probe_enclosures"])
+    if not _blank(raw.get("timeout")):
+        timeout = raw["timeout"]
+        timeout = tuple(timeout) if isinstance(timeout, (list, tuple)) else (timeout, timeout)
+        if len(timeout) != 2:
+            errors.append("timeout must be seconds or [connect, read]")
+        else:
+            values["timeout"] = tuple(_number(t, "timeout", errors) for t in timeout)
+    return values
+
+def as_feed_config(raw):
+    """Validate one dict (or pass a FeedConfig through); raises ConfigError."""
+    return raw if isinstance(raw, FeedConfig) else load_feed_configs([raw])[0]
+
+def load_feed_configs(raw_configs):
+    """Validate and normalise a list of feed dicts; FeedConfig items are kept as they are."""
+    configs, problems = [], []
+    output_paths = {}
+    for index, raw in enumerate(raw_configs):
+        if isinstance(raw, FeedConfig):
+            configs.append(raw)
+            continue
+        label = f"feed {index}"
+        if isinstance(raw, dict) and raw.get("output_path"):
+            label += f" ({raw['output_path']})"
+        if not isinstance(raw, dict):
+            problems.append(f"{label}: must be a mapping")
+            continue
+        errors = []
+        values = _normalise(raw, errors)
+        problems.extend(f"{label}: {error}" for error in dict.fromkeys(errors))
+        if errors:
+            continue
+        unknown = sorted(set(raw) - KNOWN_KEYS)
+        if unknown:
+            logging.warning(f"{label}: ignoring unknown keys {unknown}")
+        configs.append(FeedConfig(**values))
+    for config in configs:
+        path = os.path.normpath(config.output_path)
+        if path in output_paths:
+            problems.append(f"output_path {config.output_path} is used by more than one feed")
+        output_paths[path] = config
+    if problems:
+        raise ConfigError("Invalid feed catalogue:\n  " + "\n  ".join(problems))
+    return configs
+
+def _compiled_path(path):
+    directory, filename = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, "__pycache__", filename + ".catalogue.pickle")
+
+def _read_python_catalogue(path):
+    """The "feeds" list defined by a Python file, run as a module outside sys.modules."""
+    spec = spec_from_file_location("_rssonceaday_catalogue", path)
+    if spec is None:
+        raise ConfigError(f"Cannot load {path} as a Python module")
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return getattr(module, "feeds", None)
+
+def _read_catalogue(path):
+    if path.endswith(".py"):
+        data = _read_python_catalogue(path)
+        if not isinstance(data, list):
+            raise ConfigError(f"{path} must define feeds = [...]")
+        return data
+    with open(path, encoding='utf-8') as catalogue_file:
+        if path.endswith((".yaml", ".yml")):
+            if not YAML_AVAILABLE:
+                raise ConfigError(f"Reading {path} needs the 'PyYAML' module.")
+            import yaml
+
+            data = yaml.safe_load(catalogue_file)
+        else:
+            data = json.load(catalogue_file)
+    if isinstance(data, dict):
+        data = data.get("feeds")
+    if not isinstance(data, list):
+        raise ConfigError(f"{path} must hold a list of feeds or {{\"feeds\": [...]}}")
+    return data
+
+def load_catalogue(path):
+    """The validated FeedConfigs of a YAML/JSON catalogue, from the compiled copy when it is current."""
+    source = os.stat(path)
+    stamp = (CATALOGUE_VERSION, source.st_mtime_ns, source.st_size)
+    compiled = _compiled_path(path)
+    try:
+        with open(compiled, 'rb') as compiled_file:
+            cached_stamp, configs = pickle.load(compiled_file)
+        if cached_stamp == stamp:
+            return configs
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError, AttributeError, ImportError):
+        pass
+    configs = load_feed_configs(_read_catalogue(path))
+    try:
+        os.makedirs(os.path.dirname(compiled), exist_ok=True)
+        with open(compiled, 'wb') as compiled_file:
+            pickle.dump((stamp, configs), compiled_file, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError as e:
+        logging.warning(f"Could not cache the compiled catalogue at '{compiled}': {e}")
+    return configs
@@ -0,0 +1,248 @@
+"""Streaming, atomic writers for the feed output formats.
+
+Entries are serialized one at a time into a temporary file next to the target,
+which then replaces the target with os.replace. A crash mid-run leaves the old
+file in place, and identical output leaves the file (and its mtime) untouched.
+
+Every format is rendered from the same entry store records, and "gz"/"br" in a
+feed's formats add precompressed siblings (atom.xml.gz, ...) for static hosts.
+"""
+import filecmp
+import json
+import logging
+import os
+import stat
+import tempfile
+import zlib
+from email.utils import format_datetime
+from importlib.util import find_spec
+from datetime import datetime, timezone
+from xml.sax.saxutils import escape, quoteattr
+
+from .enclosures import enclosure_info
+from .entry_store import FIRST_SEEN, entry_updated, newest_first, output_record
+from .run_report import stage
+
+BROTLI_AVAILABLE = find_spec("brotli") is not None
+
+DEFAULT_FORMATS = ["xml", "json"]
+
+# format name -> output file name; "xml" is the historical name for Atom
+FORMAT_FILES = {
+    "xml": "atom.xml",
+    "atom": "atom.xml",
+    "rss": "rss.xml",
+    "json": "feed.json",
+    "jsonfeed": "jsonfeed.json",
+}
+COMPRESSED_FORMATS = ("gz", "br")
+
+_COPY_BLOCK = 64 * 1024
+
+_warned_formats = set()
+
+def _warn_once(message):
+    if message not in _warned_formats:
+        _warned_formats.add(message)
+        logging.warning(message)
+
+def atomic_write(path, chunks, binary=False):
+    """Write the chunks to path atomically; returns False if the bytes were already on disk."""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with (os.fdopen(fd, 'wb') if binary else os.fdopen(fd, 'w', encoding='utf-8', newline='')) as tmp_file:
+            for chunk in chunks:
+                tmp_file.write(chunk)
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+        if os.path.exists(path) and filecmp.cmp(tmp_path, path, shallow=False):
+            os.remove(tmp_path)
+            return False
+        # mkstemp creates 0600 files; keep the target's mode, or make new files world-readable
+        os.chmod(tmp_path, stat.S_IMODE(os.stat(path).st_mode) if os.path.exists(path) else 0o644)
+        os.replace(tmp_path, path)
+        return True
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def _element(name, text):
+    return f"<{name}>{escape(text)}</{name}>"
+
+def atom_chunks(feed_config, entries, updated, enclosures=None):
+    """Yield an Atom document for entries given newest first; enclosures are the probed image metadata."""
+    url = feed_config.url
+    yield "<?xml version='1.0' encoding='UTF-8'?>\n"
+    yield f'<feed xmlns="http://www.w3.org/2005/Atom" xml:lang={quoteattr(feed_config.language)}>'
+    yield _element("id", url) + _element("title", feed_config.title) + _element("updated", updated)
+    yield ("<author>" + _element("name", feed_config.author_name)
+           + _element("email", feed_config.author_email) + "</author>")
+    yield f'<link href={quoteattr(url)} rel="alternate"/>'
+    yield _element("subtitle", feed_config.subtitle)
+    for entry in entries:
+        parts = ["<entry>", _element("id", entry["ID"]), _element("title", entry["Title"]),
+                 _element("updated", entry_updated(entry) or updated)]
+        if "Published" in entry:
+            parts.append(_element("published", entry["Published"]))
+        if "Author" in entry:
+            parts.append("<author>" + _element("name", entry["Author"]) + "</author>")
+        parts.append(_element("content", entry["Description"]))
+        parts.append(f'<link href={quoteattr(entry["Link"])} rel="alternate"/>')
+        if "Image" in entry:
+            info = enclosure_info(entry["Image"], enclosures)
+            length = f' length="{info["length"]}"' if info["length"] is not None else ""
+            parts.append(f'<link href={quoteattr(entry["Image"])} rel="enclosure" type={quoteattr(info["type"])}{length}/>')
+        parts.append("</entry>")
+        yield "".join(parts)
+    yield "</feed>\n"
+
+def json_chunks(entries):
+    """Yield the same text json.dump(records, indent=4) would produce, one entry at a time."""
+    first = True
+    for entry in entries:
+        body = json.dumps(output_record(entry), indent=4).replace("\n", "\n    ")
+        yield ("[\n    " if first else ",\n    ") + body
+        first = False
+    yield "[]" if first else "\n]"
+
+def _rfc822(timestamp):
+    return format_datetime(datetime.strptime(timestamp, '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc))
+
+def rss_chunks(feed_config, entries, updated, enclosures=None):
+    """Yield an RSS 2.0 document for entries given newest first."""
+    yield "<?xml version='1.0' encoding='UTF-8'?>\n"
+    yield '<rss version="2.0"><channel>'
+    yield (_element("title", feed_config.title) + _element("link", feed_config.url)
+           + _element("description", feed_config.subtitle) + _element("language", feed_config.language)
+           + _element("lastBuildDate", _rfc822(updated)))
+    for entry in entries:
+        parts = ["<item>", _element("title", entry["Title"]), _element("link", entry["Link"]),
+                 f'<guid isPermaLink="false">{escape(entry["ID"])}</guid>',
+                 _element("description", entry["Description"])]
+        published = entry.get("Published") or entry.get(FIRST_SEEN)
+        if published:
+            parts.append(_element("pubDate", _rfc822(published)))
+        if "Author" in entry:
+            parts.append(_element("author", entry["Author"]))
+        if "Image" in entry:
+            info = enclosure_info(entry["Image"], enclosures)
+            # RSS requires a length; 0 is the conventional "unknown"
+            parts.append(f'<enclosure url={quoteattr(entry["Image"])} type={quoteattr(info["type"])} '
+                         f'length="{info["length"] or 0}"/>')
+        parts.append("</item>")
+        yield "".join(parts)
+    yield "</channel></rss>\n"
+
+def jsonfeed_chunks(feed_config, entries, enclosures=None):
+    """Yield a JSON Feed 1.1 document for entries given newest first."""
+    header = {
+        "version": "https://jsonfeed.org/version/1.1",
+        "title": feed_config.title,
+        "home_page_url": feed_config.url,
+        "description": feed_config.subtitle,
+        "language": feed_config.language,
+        "authors": [{"name": feed_config.author_name}],
+    }
+    yield json.dumps(header, indent=4)[:-2] + ',\n    "items": ['
+    first = True
+    for entry in entries:
+        item = {"id": entry["ID"], "url": entry["Link"], "title": entry["Title"],
+                "content_text": entry["Description"]}
+        published = entry.get("Published") or entry.get(FIRST_SEEN)
+        if published:
+            item["date_published"] = published
+        modified = entry_updated(entry)
+        if modified:
+            item["date_modified"] = modified
+        if "Author" in entry:
+            item["authors"] = [{"name": entry["Author"]}]
+        if "Image" in entry:
+            info = enclosure_info(entry["Image"], enclosures)
+            attachment = {"url": entry["Image"], "mime_type": info["type"]}
+            if info["length"] is not None:
+                attachment["size_in_bytes"] = info["length"]
+            item["attachments"] = [attachment]
+        body = json.dumps(item, indent=4).replace("\n", "\n        ")
+        yield ("\n        " if first else ",\n        ") + body
+        first = False
+    yield "]\n}" if first else "\n    ]\n}"
+
+def _compressed_chunks(path, kind):
+    """Stream-compress path; gzip output has a zero mtime so unchanged input compresses identically."""
+    if kind == "gz":
+        compressor = zlib.compressobj(9, zlib.DEFLATED, 31)
+    else:
+        import brotli
+
+        compressor = brotli.Compressor()
+    compress = compressor.compress if kind == "gz" else compressor.process
+    with open(path, 'rb') as source:
+        for block in iter(lambda: source.read(_COPY_BLOCK), b''):
+            yield compress(block)
+    yield compressor.flush() if kind == "gz" else compressor.finish()
+
+def write_atom(path, feed_config, entries, updated, enclosures=None):
+    return atomic_write(path, atom_chunks(feed_config, entries, updated, enclosures))
+
+def write_rss(path, feed_config, entries, updated, enclosures=None):
+    return atomic_write(path, rss_chunks(feed_config, entries, updated, enclosures))
+
+def write_json(path, entries):
+    return atomic_write(path, json_chunks(entries))
+
+def write_jsonfeed(path, feed_config, entries, enclosures=None):
+    return atomic_write(path, jsonfeed_chunks(feed_config, entries, enclosures))
+
+def feed_formats(feed_config):
+    """Split a config's formats into (output formats, compressions), dropping unknown names."""
+    outputs, compressions = [], []
+    for name in feed_config.formats:
+        if name in FORMAT_FILES:
+            if FORMAT_FILES[name] not in (FORMAT_FILES[o] for o in outputs):
+                outputs.append(name)
+        elif name in COMPRESSED_FORMATS:
+            if name == "br" and not BROTLI_AVAILABLE:
+                _warn_once("Format 'br' requested but the 'brotli' module is not installed; skipping.")
+            else:
+                compressions.append(name)
+        else:
+            _warn_once(f"Unknown format '{name}' in '{feed_config.output_path}', ignoring.")
+    return outputs, compressions
+
+def output_files(feed_config):
+    outputs, compressions = feed_formats(feed_config)
+    paths = [os.path.join(feed_config.output_path, FORMAT_FILES[name]) for name in outputs]
+    return paths + [f"{path}.{kind}" for path in paths for kind in compressions]
+
+def write_outputs(feed_config, store, updated, enclosures=None):
+    """Render every configured format from the store; returns [(path, written)].
+
+    enclosures maps image URLs to their probed {"type", "length"} (see enclosures.py).
+    """
+    outputs, compressions = feed_formats(feed_config)
+    results = []
+    report_key = feed_config.output_path
+    for name in outputs:
+        path = os.path.join(feed_config.output_path, FORMAT_FILES[name])
+        with stage(report_key, f"write:{FORMAT_FILES[name]}"):
+            if name in ("xml", "atom"):
+                written = write_atom(path, feed_config, newest_first(store), updated, enclosures)
+            elif name == "rss":
+                written = write_rss(path, feed_config, newest_first(store), updated, enclosures)
+            elif name == "json":
+                written = write_json(path, newest_first(store))
+            else:
+                written = write_jsonfeed(path, feed_config, newest_first(store), enclosures)
+        results.append((path, written))
+        for kind in compressions:
+            compressed_path = f"{path}.{kind}"
+            if written or not os.path.exists(compressed_path):
+                with stage(report_key, f"write:{FORMAT_FILES[name]}.{kind}"):
+                    written_compressed = atomic_write(compressed_path, _compressed_chunks(path, kind), binary=True)
+                results.append((compressed_path, written_compressed))
+            else:
+                results.append((compressed_path, False))
+    return results
@@ -0,0 +1,105 @@
+import logging
+from functools import lru_cache
+from importlib.util import find_spec
+
+# Parsers are imported on first use; only their presence is checked here
+LXML_AVAILABLE = find_spec("lxml") is not None
+SELECTOLAX_AVAILABLE = find_spec("selectolax") is not None
+
+DEFAULT_PARSER = "html.parser"
+PARSER_BACKENDS = ("html.parser", "lxml", "selectolax")
+
+_warned_backends = set()
+
+def available_backends():
+    available = {"html.parser": True, "lxml": LXML_AVAILABLE, "selectolax": SELECTOLAX_AVAILABLE}
+    return [name for name in PARSER_BACKENDS if available[name]]
+
+def resolve_backend(name):
+    """Return name if it can be used here, otherwise fall back to html.parser."""
+    name = name or DEFAULT_PARSER
+    if name in available_backends():
+        return name
+    if name not in _warned_backends:
+        _warned_backends.add(name)
+        logging.warning(f"Parser backend '{name}' is not available, falling back to '{DEFAULT_PARSER}'.")
+    return DEFAULT_PARSER
+
+@lru_cache(maxsize=None)
+def compile_selector(css):
+    """Compile a CSS selector once per process; BeautifulSoup backends reuse it on every run."""
+    import soupsieve
+
+    return soupsieve.compile(css)
+
+class SoupDocument:
+    """A BeautifulSoup tree queried through precompiled selectors."""
+    __slots__ = ("soup",)
+
+    def __init__(self, soup):
+        self.soup = soup
+
+    def select(self, css):
+        return compile_selector(css).select(self.soup)
+
+    def select_one(self, css):
+        return compile_selector(css).select_one(self.soup)
+
+class LexborNode:
+    """Adapts a selectolax node to the parts of the bs4 Tag API we use."""
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+    @property
+    def text(self):
+        return self.node.text(deep=True)
+
+    def get(self, name, default=None):
+        value = self.node.attributes.get(name)
+        return default if value is None else value
+
+    def __getitem__(self, name):
+        return self.node.attributes[name]
+
+    def __str__(self):
+        return self.node.html
+
+class LexborDocument:
+    """A selectolax (lexbor) tree with the same select/select_one API as SoupDocument."""
+    __slots__ = ("tree",)
+
+    def __init__(self, tree):
+        self.tree = tree
+
+    def select(self, css):
+        return [LexborNode(node) for node in self.tree.css(css)]
+
+    def select_one(self, css):
+        node = self.tree.css_first(css)
+        return LexborNode(node) if node is not None else None
+
+def select_from(node, css):
+    """Nodes matching css inside node, a bs4 Tag or a LexborNode."""
+    if isinstance(node, LexborNode):
+        return [LexborNode(match) for match in node.node.css(css)]
+    return compile_selector(css).select(node)
+
+def select_one_from(node, css):
+    """First node matching css inside node, or None."""
+    if isinstance(node, LexborNode):
+        match = node.node.css_first(css)
+        return LexborNode(match) if match is not None else None
+    return compile_selector(css).select_one(node)
+
+def parse_html(text, backend=DEFAULT_PARSER):
+    """Parse text with the given backend (falling back to html.parser if missing)."""
+    backend = resolve_backend(backend)
+    if backend == "selectolax":
+        from selectolax.lexbor import LexborHTMLParser
+
+        return LexborDocument(LexborHTMLParser(text))
+    from bs4 import BeautifulSoup
+
+    return SoupDocument(BeautifulSoup(text, backend))
@@ -0,0 +1,110 @@
+"""Shared HTTP session: pooled keep-alive connections, compression, timeouts and retries.
+
+Every fetch goes through one requests.Session per process. Connections to a
+host are reused across feeds, runs and (in daemon mode) scheduler batches.
+Per-feed keys in feed.py:
+
+    "timeout": 20 or [5, 30]     connect/read timeout in seconds
+    "retries": 2                 extra attempts after a timeout, connection error or 429/5xx
+    "retry_backoff": 1.0         first retry delay in seconds, doubled on each attempt
+"""
+import logging
+import threading
+import time
+from importlib.util import find_spec
+
+DEFAULT_TIMEOUT = (10, 30)
+DEFAULT_RETRIES = 2
+DEFAULT_RETRY_BACKOFF = 1.0
+MAX_RETRY_DELAY = 60
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+POOL_CONNECTIONS = 16  # hosts kept in the pool
+POOL_MAXSIZE = 8       # connections kept per host
+
+ACCEPT_ENCODING = "gzip, deflate, br" if find_spec("brotli") is not None else "gzip, deflate"
+USER_AGENT = "rssonceaday (+https://github.com/Launacloud/rssonceaday)"
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    """The process-wide session, created on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({"Accept-Encoding": ACCEPT_ENCODING, "User-Agent": USER_AGENT})
+            _session = session
+        return _session
+
+def fetch_options(feed_configs):
+    """Merge the timeout/retry settings of the feeds sharing a URL, taking the most patient."""
+    timeouts = [feed_config.timeout for feed_config in feed_configs] or [DEFAULT_TIMEOUT]
+    return {
+        "timeout": (max(t[0] for t in timeouts), max(t[1] for t in timeouts)),
+        "retries": max([feed_config.retries for feed_config in feed_configs] or [DEFAULT_RETRIES]),
+        "retry_backoff": max([feed_config.retry_backoff for feed_config in feed_configs] or [DEFAULT_RETRY_BACKOFF]),
+    }
+
+def _retry_delay(attempt, retry_backoff, response=None):
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return min(MAX_RETRY_DELAY, int(retry_after))
+    return min(MAX_RETRY_DELAY, retry_backoff * 2 ** attempt)
+
+def fetch(url, headers=None, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES, retry_backoff=DEFAULT_RETRY_BACKOFF):
+    """GET url through the shared session, retrying transient failures with exponential backoff.
+
+    Returns the last response (which may still be a 429/5xx) or raises the last
+    requests.RequestException once the retries are used up.
+    """
+    import requests
+
+    session = get_session()
+    for attempt in range(retries + 1):
+        try:
+            r = session.get(url, headers=headers, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt == retries:
+                raise
+            delay = _retry_delay(attempt, retry_backoff)
+            logging.warning(f"Retrying {url} in {delay:.1f}s after error: {e}")
+        else:
+            if r.status_code not in RETRY_STATUSES or attempt == retries:
+                return r
+            delay = _retry_delay(attempt, retry_backoff, r)
+            logging.warning(f"Retrying {url} in {delay:.1f}s after status {r.status_code}")
+        time.sleep(delay)
+
+def head(url, headers=None, timeout=DEFAULT_TIMEOUT):
+    """HEAD url through the shared session, following redirects; raises requests.RequestException."""
+    return get_session().head(url, headers=headers, timeout=timeout, allow_redirects=True)
+
+def connection_stats():
+    """Connections opened vs requests sent through the session's pools."""
+    stats = {"hosts": 0, "connections": 0, "requests": 0}
+    if _session is None:
+        return stats
+    for adapter in {id(a): a for a in _session.adapters.values()}.values():
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            stats["hosts"] += 1
+            stats["connections"] += pool.num_connections
+            stats["requests"] += pool.num_requests
+    return stats
+
+def log_connection_stats():
+    stats = connection_stats()
+    if stats["requests"]:
+        reused = stats["requests"] - stats["connections"]
+        logging.info(f"HTTP pool: {stats['requests']} requests over {stats['connections']} connections "
+                     f"to {stats['hosts']} hosts ({reused} reused)")
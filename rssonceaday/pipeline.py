@@ -0,0 +1,713 @@
+"""Generate Atom/RSS/JSON feeds by scraping the pages configured in a catalogue.
+
+Library use: generate(feed_config) builds one feed and generate_feeds(configs)
+a catalogue; both return result dicts. The CLI is main(); it reads feed.py from
+the working directory unless --catalogue names another file. Heavy dependencies
+(requests, bs4, GitPython) are imported on first use so that importing this
+module or regenerating a single feed stays cheap.
+"""
+import os
+import json
+import hashlib
+import sys
+import time
+import logging
+import argparse
+import fnmatch
+import threading
+import zlib
+from importlib.util import find_spec
+from itertools import islice
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from datetime import timezone
+from urllib.parse import urljoin, urlsplit
+
+from .date_parsing import parse_date
+from .enclosures import resolve_enclosures
+from .entry_store import (evict_entries, feed_updated, load_store, merge_entries, newest_first, output_record,
+                         utc_timestamp)
+from .extraction import ENTRY_FIELDS, extract_records
+from .feed_config import DEFAULT_CATALOGUE, ConfigError, as_feed_config, load_catalogue, load_feed_configs
+from .feed_writers import atomic_write, output_files, write_outputs
+from .http_client import fetch, fetch_options, log_connection_stats
+from .html_parsers import DEFAULT_PARSER, PARSER_BACKENDS, parse_html, resolve_backend
+from .run_logging import DEFAULT_LOG_FILE, LOG_FORMATS, feed_logging, log_summary, setup_logging, worker_logging
+from .run_report import add_time, merge_records, note, report_active, stage, start_report, stop_report
+
+GIT_AVAILABLE = find_spec("git") is not None
+
+# Concurrency defaults: global worker cap and simultaneous requests per host
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MAX_PER_HOST = 2
+
+def generate_entry_id(title):
+    unique_string = title.strip()
+    return hashlib.md5(unique_string.encode('utf-8')).hexdigest()
+
+def feed_cache_path(feed_config):
+    return os.path.join(feed_config.output_path, 'feed_cache.json')
+
+# feed_cache.json contents kept in memory across runs of a long-lived process,
+# keyed by path and valid while the file's (mtime, size) is unchanged
+_cache_memo = {}
+
+def _file_stamp(path):
+    try:
+        stat_result = os.stat(path)
+    except OSError:
+        return None
+    return (stat_result.st_mtime_ns, stat_result.st_size)
+
+def load_feed_cache(feed_config):
+    """Read feeds/<name>/feed_cache.json, returning {} if missing or unreadable."""
+    path = feed_cache_path(feed_config)
+    stamp = _file_stamp(path)
+    memo = _cache_memo.get(path)
+    if stamp is not None and memo is not None and memo[0] == stamp:
+        return memo[1]
+    try:
+        with open(path) as cache_file:
+            cache = json.load(cache_file)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict):
+        return {}
+    # Older runs stored a bare {entry_id: true} seen-set here; the entry store replaces it
+    cache = {key: value for key, value in cache.items() if value is not True}
+    _cache_memo[path] = (stamp, cache)
+    return cache
+
+def save_feed_cache(feed_config, cache):
+    path = feed_cache_path(feed_config)
+    written = atomic_write(path, [json.dumps(cache, indent=4)])
+    _cache_memo[path] = (_file_stamp(path), cache)
+    return written
+
+def forget_feed_cache(feed_config):
+    """Drop the in-memory copy, e.g. after a run that modified it failed before saving."""
+    _cache_memo.pop(feed_cache_path(feed_config), None)
+
+def outputs_exist(feed_config):
+    return all(os.path.exists(path) for path in output_files(feed_config))
+
+def validators_from_response(r):
+    return {"etag": r.headers.get("ETag"), "last_modified": r.headers.get("Last-Modified")}
+
+def config_hash(feed_config):
+    return hashlib.sha256(json.dumps(feed_config.as_dict(), sort_keys=True).encode('utf-8')).hexdigest()
+
+def selection_hash(feed_config, records, image_url=None):
+    """Hash the config and every extracted field value, in item order."""
+    digest = hashlib.sha256(config_hash(feed_config).encode('ascii'))
+    digest.update(json.dumps([records, image_url], ensure_ascii=False).encode('utf-8'))
+    return digest.hexdigest()
+
+def built_with_config(feed_config):
+    """True if the feed's outputs exist and were last built from this exact config."""
+    return outputs_exist(feed_config) and load_feed_cache(feed_config).get("config_hash") == config_hash(feed_config)
+
+def content_unchanged(url_configs, content_hash):
+    """True if every feed of a URL was last built, with its current config, from a body with this hash."""
+    return all(built_with_config(feed_config) and load_feed_cache(feed_config).get("content_hash") == content_hash
+               for feed_config in url_configs)
+
+def conditional_headers(url_configs):
+    """Build If-None-Match/If-Modified-Since headers shared by every feed of a URL.
+
+    Validators are only sent when all feeds of the URL already have their output
+    files, built with their current config, and agree on the stored values, so a
+    304 can safely skip all of them.
+    """
+    validators = set()
+    for feed_config in url_configs:
+        if not built_with_config(feed_config):
+            return {}
+        cache = load_feed_cache(feed_config)
+        validators.add((cache.get("etag"), cache.get("last_modified")))
+    if len(validators) != 1:
+        return {}
+    etag, last_modified = validators.pop()
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+def group_feeds_by_url(feed_configs):
+    """Group feed configs by source URL, keeping first-seen order."""
+    groups = {}
+    for feed_config in feed_configs:
+        groups.setdefault(feed_config.url, []).append(feed_config)
+    return groups
+
+def feed_result(feed_config, status, written=(), entries=None):
+    """The per-feed result returned by generate/generate_feeds (and noted in the run report)."""
+    note(feed_config.output_path, url=feed_config.url, status=status)
+    return {"name": feed_config.name, "output_path": feed_config.output_path, "url": feed_config.url,
+            "status": status, "written": list(written), "entries": entries}
+
+def _download(url, headers=None, options=None):
+    with stage(url, "fetch"):
+        return fetch(url, headers=headers, **(options or {}))
+
+def start_downloads(urls, executor, max_per_host=DEFAULT_MAX_PER_HOST, headers=None, options=None):
+    """Start one download per URL, with at most max_per_host in flight per host; returns {url: future}.
+
+    Each host has its own queue, and a URL is only submitted to the executor once
+    its host has a free slot, so URLs waiting on a busy host never hold a worker
+    that another host's page could use. headers and options optionally map a URL
+    to the request headers and the http_client.fetch timeout/retry options to use.
+    """
+    headers = headers or {}
+    options = options or {}
+    max_per_host = max(1, max_per_host)
+    queues = {}
+    pending = {}
+    for url in urls:
+        queues.setdefault(urlsplit(url).hostname, deque()).append(url)
+        pending[url] = Future()
+    lock = threading.Lock()
+
+    def submit_next(queue):
+        with lock:
+            if not queue:
+                return
+            url = queue.popleft()
+        try:
+            download = executor.submit(_download, url, headers.get(url), options.get(url))
+        except RuntimeError as e:  # the executor was shut down, e.g. after an error in the caller
+            pending[url].set_exception(e)
+            submit_next(queue)
+            return
+        download.add_done_callback(lambda done: finished(done, pending[url], queue))
+
+    def finished(done, future, queue):
+        submit_next(queue)  # hand the host's slot to its next URL first
+        if done.exception() is not None:
+            future.set_exception(done.exception())
+        else:
+            future.set_result(done.result())
+
+    for queue in queues.values():
+        for _ in range(min(max_per_host, len(queue))):
+            submit_next(queue)
+    return pending
+
+def fetch_page(url, pending=None, headers=None, options=None):
+    """Download a page; returns the response (200 or 304) or None on failure.
+
+    If pending is given it is a future for a download already in flight.
+    """
+    import requests
+
+    try:
+        if pending is not None:
+            r = pending.result()
+        else:
+            with stage(url, "fetch"):
+                r = fetch(url, headers=headers, **(options or {}))
+        logging.info(f"Fetching {url} - Status Code: {r.status_code}")
+        logging.info("Response length: %d bytes", len(r.content))
+        note(url, status_code=r.status_code, bytes_fetched=len(r.content))
+    except requests.RequestException as e:
+        logging.error(f"Network error fetching {url}: {e}")
+        note(url, error=str(e))
+        return None
+
+    if r.status_code not in (200, 304):
+        logging.warning(f"Failed to fetch content from {url} - Status: {r.status_code}")
+        return None
+    return r
+
+def parse_page(r, backend=DEFAULT_PARSER, url=None):
+    backend = resolve_backend(backend)
+    with stage(url or r.url, f"parse:{backend}"):
+        soup = parse_html(r.text, backend)
+    logging.info(f"HTML parsed with {backend}")
+    return soup
+
+def build_entry(feed_config, record, image_url=None):
+    """The entry dict for one extracted record (see extraction.py for the field names)."""
+    title = record["title"]
+    subtitle = record.get("subtitle")
+    description_text = record.get("description")
+    # Field values are already plain text, so they are stripped rather than parsed again
+    parts = ["No description found" if description_text is None else description_text.strip()]
+    parts.extend(value for name, value in record.items() if name not in ENTRY_FIELDS and value and value.strip())
+
+    entry_data = {
+        "Title": f"{title} - {subtitle}" if subtitle and subtitle.strip() else title,
+        "ID": generate_entry_id(title),
+        "Description": "\n ".join(parts),
+        "Link": urljoin(feed_config.url, record.get("link"))
+    }
+    image = urljoin(feed_config.url, record["image"]) if record.get("image") else image_url
+    if image:
+        entry_data["Image"] = image
+    author = record.get("author")
+    if author and author.strip():
+        entry_data["Author"] = author
+    date_text, date_format = record.get("date"), feed_config.item_date_format
+    if date_text and date_format:
+        published = parse_date(date_text, date_format, feed_config.item_timezone)
+        if published:
+            entry_data["Published"] = utc_timestamp(published.astimezone(timezone.utc))
+        else:
+            logging.warning(f"Could not parse date '{date_text.strip()}' with format '{date_format}'")
+    return entry_data
+
+def generate_feed(feed_config, should_print_last_entries=False, soup=None, force=False, cache_updates=None):
+    """Build one feed and return its result dict (see feed_result).
+
+    The feed's cache file is updated with cache_updates and the hash of the
+    selected nodes. Unless force is set, an unchanged selection skips entry
+    building and file writes. feed_config is a FeedConfig or a config dict.
+    """
+    feed_config = as_feed_config(feed_config)
+    try:
+        with feed_logging(feed_config):
+            return _generate_feed(feed_config, should_print_last_entries, soup, force, cache_updates)
+    except BaseException:
+        forget_feed_cache(feed_config)
+        raise
+
+def _generate_feed(feed_config, should_print_last_entries, soup, force, cache_updates):
+    report_key = feed_config.output_path
+    json_file_path = os.path.join(feed_config.output_path, 'feed.json')
+
+    logging.info("Checking files: " + ", ".join(f"{os.path.basename(path)} exists={os.path.exists(path)}"
+                                                for path in output_files(feed_config)))
+
+    if soup is None:
+        r = fetch_page(feed_config.url, options=fetch_options([feed_config]))
+        if r is None:
+            return feed_result(feed_config, "fetch_failed")
+        soup = parse_page(r, feed_config.parser, url=feed_config.url)
+
+    records = extract_records(soup, feed_config)
+
+    # A page-wide image (e.g. Wikipedia's picture of the day) attached to every entry
+    image_url = None
+    if feed_config.enclosure_css:
+        img_tag = soup.select_one(feed_config.enclosure_css)
+        if img_tag is not None and img_tag.get(feed_config.enclosure_attr):
+            image_url = urljoin(feed_config.url, img_tag.get(feed_config.enclosure_attr))
+
+    cache = load_feed_cache(feed_config)
+    cache.update(cache_updates or {}, config_hash=config_hash(feed_config))
+    with stage(report_key, "hash"):
+        new_selection_hash = selection_hash(feed_config, records, image_url)
+    if not force and outputs_exist(feed_config) and cache.get("selection_hash") == new_selection_hash:
+        logging.info(f"Selected content unchanged, skipping '{feed_config.output_path}'")
+        # Only the fetch state (validators, body hash) changed: keep it on disk, but don't
+        # report the file, or every page with a rotating ad or token would make a commit
+        with stage(report_key, "write:feed_cache.json"):
+            save_feed_cache(feed_config, cache)
+        return feed_result(feed_config, "selection_unchanged")
+    cache["selection_hash"] = new_selection_hash
+
+    if logging.getLogger().isEnabledFor(logging.INFO):
+        logging.info("Found %d items: %s", len(records), [record['title'].strip() for record in records[:3]])
+        logging.info("URLs: %s", [record.get('link') for record in records[:3]])
+        logging.info("Descriptions: %s", [(record.get('description') or '').strip()[:50] for record in records[:3]])
+        logging.info("Dates: %s", [(record.get('date') or '').strip() for record in records[:3]])
+    if image_url:
+        logging.info("Found image URL: %s", image_url)
+
+    build_started = time.perf_counter()
+    page_entries = []
+    for i, record in enumerate(records):
+        entry_data = build_entry(feed_config, record, image_url)
+        logging.info("Processing entry %d: Title='%s', ID=%s", i + 1, record['title'], entry_data['ID'])
+        page_entries.append(entry_data)
+    note(report_key, entries_found=len(page_entries))
+    add_time(report_key, "build", time.perf_counter() - build_started)
+
+    # Merge into the persistent history so yesterday's entries survive
+    with stage(report_key, "history"):
+        store = load_store(cache, json_file_path)
+        added = merge_entries(store, page_entries)
+        evicted = evict_entries(store, feed_config.max_entries, feed_config.max_age_days)
+    cache["entries"] = store
+    if feed_config.probe_enclosures:
+        with stage(report_key, "enclosures"):
+            images = [entry["Image"] for entry in store.values() if entry.get("Image")]
+            probed = resolve_enclosures(images, cache.setdefault("enclosures", {}), feed_config.enclosure_ttl)
+        note(report_key, enclosures_probed=probed)
+    note(report_key, entries_retained=len(store))
+    logging.info(f"History: {added} new, {evicted} evicted, {len(store)} retained")
+
+    # The feed is as fresh as its most recently changed entry, so unchanged history serializes identically
+    updated = feed_updated(store) or utc_timestamp()
+    written_files = []
+    for path, written in write_outputs(feed_config, store, updated, cache.get("enclosures")):
+        if written:
+            written_files.append(path)
+            logging.info(f"Updated '{path}' with {len(store)} entries.")
+        else:
+            logging.info(f"Unchanged '{path}', not rewritten.")
+    with stage(report_key, "write:feed_cache.json"):
+        # The history is committed along with the outputs it produced, never on its own
+        if save_feed_cache(feed_config, cache) and written_files:
+            written_files.append(feed_cache_path(feed_config))
+
+    if should_print_last_entries and store:
+        logging.info("\n📌 Last 3 entries:")
+        for entry in map(output_record, islice(newest_first(store), 3)):
+            logging.info(f"🔹 Title: {entry['Title']}")
+            logging.info(f"🔹 URL: {entry['Link']}")
+            logging.info(f"🔹 Description: {entry['Description']}")
+            if "Image" in entry:
+                logging.info(f"🔹 Image: {entry['Image']}")
+            logging.info("-" * 50)
+    return feed_result(feed_config, "built", written=written_files, entries=len(store))
+
+def changed_files(results):
+    """Every file the run actually rewrote, in result order."""
+    return [path for result in results for path in result["written"]]
+
+def report_git_changes(files):
+    """Commit exactly the given files; nothing is scanned and nothing is committed if the list is empty."""
+    if not files:
+        logging.info("\n✅ No feed files changed, nothing to commit.")
+        return
+    if not GIT_AVAILABLE:
+        logging.warning("Warning: 'gitpython' module not found. Git change reporting will be skipped.")
+        return
+    with stage("git", "git"):
+        _commit_changes(files)
+
+def _commit_identity(repo):
+    """Author/committer for the feed commit only: $GIT_AUTHOR_*, the repo's user, or the Action's.
+
+    Passed as environment to the one git commit, never written to the repository config.
+    """
+    reader = repo.config_reader()
+    name = os.getenv('GIT_AUTHOR_NAME') or reader.get_value('user', 'name', '') or 'GitHub Action'
+    email = os.getenv('GIT_AUTHOR_EMAIL') or reader.get_value('user', 'email', '') or 'action@github.com'
+    return {"GIT_AUTHOR_NAME": name, "GIT_AUTHOR_EMAIL": email, "GIT_COMMITTER_NAME": name,
+            "GIT_COMMITTER_EMAIL": email}
+
+def _commit_changes(files):
+    from git import Repo
+
+    try:
+        repo = Repo(os.getcwd(), search_parent_directories=True)
+        root = repo.working_tree_dir
+        paths = []
+        for path in dict.fromkeys(files):
+            relative = os.path.relpath(os.path.abspath(path), root)
+            if relative.startswith(os.pardir + os.sep):
+                logging.warning(f"Not committing '{path}': outside the repository.")
+            else:
+                paths.append(relative)
+        if not paths:
+            return
+        repo.git.add('--', *paths)
+        # -z: unquoted, NUL-separated paths, so non-ASCII feed names stay usable as pathspecs
+        staged = [path for path in repo.git.diff('--cached', '--name-only', '-z', '--', *paths).split('\0') if path]
+        if not staged:
+            logging.info("\n✅ Rewritten feed files match the last commit, nothing to commit.")
+            return
+        logging.info("\n📝 Git Changes Detected:")
+        logging.info(repo.git(c='core.quotePath=false').diff('--cached', '--stat', '--', *staged))
+        repo.git.commit('-m', "Update RSS and JSON Feeds", '--', *staged, env=_commit_identity(repo))
+        logging.info(f"Committed {len(staged)} changed feed files to Git.")
+    except Exception as e:
+        logging.warning(f"Git operation failed (non-fatal): {e}")
+
+def _build_group(url, url_configs, r, should_print_last_entries, force, default_parser):
+    """Build the feeds of one fetched URL; returns their results in url_configs order."""
+    if r.status_code == 304:
+        results = []
+        for feed_config in url_configs:
+            logging.info(f"Not modified, skipping '{feed_config.output_path}'")
+            results.append(feed_result(feed_config, "not_modified"))
+        return results
+    content_hash = hashlib.sha256(r.content).hexdigest()
+    if not force and content_unchanged(url_configs, content_hash):
+        results = []
+        for feed_config in url_configs:
+            logging.info(f"Content unchanged (sha256 {content_hash[:12]}), skipping '{feed_config.output_path}'")
+            results.append(feed_result(feed_config, "content_unchanged"))
+        return results
+    documents = {}  # one parse per backend in use for this URL
+    cache_updates = dict(validators_from_response(r), content_hash=content_hash)
+    results = []
+    for feed_config in url_configs:
+        backend = resolve_backend(feed_config.parser or default_parser)
+        if backend not in documents:
+            documents[backend] = parse_page(r, backend, url=url)
+        results.append(generate_feed(feed_config, should_print_last_entries=should_print_last_entries,
+                                     soup=documents[backend], force=force, cache_updates=cache_updates))
+    return results
+
+def _build_group_in_process(url, url_configs, r, should_print_last_entries, force, default_parser, report):
+    """_build_group in a worker process; also returns the worker's run report records if report is set."""
+    if report:
+        start_report()
+    try:
+        results = _build_group(url, url_configs, r, should_print_last_entries, force, default_parser)
+    finally:
+        worker_report = stop_report()
+    return results, worker_report.records if worker_report else None
+
+def _build_feeds(groups, pending, headers, options, should_print_last_entries, force, default_parser,
+                 process_pool=None):
+    """Build every group; returns {id(feed_config): result}.
+
+    With a process_pool each fetched page is handed to a worker process to be
+    parsed and built while the next page is awaited here.
+    """
+    results = {}
+    building = []
+    for url, url_configs in groups.items():
+        if len(url_configs) > 1:
+            logging.info(f"Sharing one fetch of {url} across {len(url_configs)} feeds")
+        r = fetch_page(url, pending.get(url), headers.get(url), options.get(url))
+        if r is None:
+            for feed_config in url_configs:
+                results[id(feed_config)] = feed_result(feed_config, "fetch_failed")
+        elif process_pool is None:
+            group_results = _build_group(url, url_configs, r, should_print_last_entries, force, default_parser)
+            results.update(zip(map(id, url_configs), group_results))
+        else:
+            building.append((url_configs, process_pool.submit(
+                _build_group_in_process, url, url_configs, r, should_print_last_entries, force, default_parser,
+                report_active())))
+    for url_configs, future in building:
+        group_results, records = future.result()
+        merge_records(records)
+        results.update(zip(map(id, url_configs), group_results))
+    return results
+
+def _init_worker(initializer, initargs):
+    import signal
+
+    # Ctrl-C reaches the whole process group; the parent decides when the pool stops
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    initializer(*initargs)
+
+@contextmanager
+def worker_pool(processes):
+    """A process pool for generate_feeds(process_pool=...), whose workers log through this process's handlers.
+
+    Workers are spawned rather than forked, as downloads may already be running in threads.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    mp_context = multiprocessing.get_context("spawn")
+    with worker_logging(mp_context) as (initializer, initargs):
+        with ProcessPoolExecutor(max_workers=processes, mp_context=mp_context, initializer=_init_worker,
+                                 initargs=(initializer, initargs)) as process_pool:
+            yield process_pool
+
+def generate_feeds(feed_configs, should_print_last_entries=False,
+                   max_workers=DEFAULT_MAX_WORKERS, max_per_host=DEFAULT_MAX_PER_HOST, force=False,
+                   default_parser=DEFAULT_PARSER, processes=1, process_pool=None):
+    """Fetch and parse each distinct URL once, then build every feed that uses it.
+
+    With max_workers > 1 downloads run in a thread pool while parsing, building
+    and logging stay on the calling thread in config order. With processes > 1
+    pages are still fetched here, but parsed and built in that many worker
+    processes; the results, files and run report are the same as a serial
+    run's. A process_pool from worker_pool() is used instead of starting one,
+    so callers running many batches (the daemon) keep their workers. force ignores stored validators and content hashes and rebuilds
+    every feed. default_parser is the HTML backend for feeds that don't set
+    "parser" themselves.
+
+    Returns one result dict per config, in config order. Config dicts are
+    validated first (see feed_config.load_feed_configs).
+    """
+    feed_configs = load_feed_configs(feed_configs)
+    max_per_host = max(1, max_per_host)  # 0 would never start a download and leave the run waiting
+    groups = group_feeds_by_url(feed_configs)
+    headers = {url: {} if force else conditional_headers(url_configs) for url, url_configs in groups.items()}
+    options = {url: fetch_options(url_configs) for url, url_configs in groups.items()}
+    with ExitStack() as stack:
+        if process_pool is None and processes > 1 and len(groups) > 1:
+            process_pool = stack.enter_context(worker_pool(min(processes, len(groups))))
+        pending = {}
+        if max_workers > 1 and len(groups) > 1:
+            executor = stack.enter_context(ThreadPoolExecutor(max_workers=max_workers))
+            pending = start_downloads(groups, executor, max_per_host=max_per_host, headers=headers, options=options)
+        results = _build_feeds(groups, pending, headers, options, should_print_last_entries, force, default_parser,
+                               process_pool)
+    log_connection_stats()
+    return [results[id(feed_config)] for feed_config in feed_configs]
+
+def generate(feed_config, force=False, default_parser=DEFAULT_PARSER, should_print_last_entries=False):
+    """Build a single feed from its FeedConfig or config dict and return its result dict."""
+    return generate_feeds([feed_config], should_print_last_entries=should_print_last_entries, max_workers=1,
+                          force=force, default_parser=default_parser)[0]
+
+def select_feeds(feed_configs, names=None, pattern=None):
+    """Filter configs by exact feed name (output directory) and/or a glob on the name."""
+    selected = [feed_config for feed_config in feed_configs
+                if (not names or feed_config.name in names)
+                and (not pattern or fnmatch.fnmatch(feed_config.name, pattern))]
+    unknown = set(names or ()) - {feed_config.name for feed_config in feed_configs}
+    for name in sorted(unknown):
+        logging.warning(f"No feed named '{name}' in the catalogue.")
+    return selected
+
+def _count(minimum):
+    """argparse type for an integer of at least minimum."""
+    def parse(text):
+        try:
+            value = int(text)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"expected a whole number, not {text!r}") from None
+        if value < minimum:
+            raise argparse.ArgumentTypeError(f"must be at least {minimum}, not {value}")
+        return value
+    return parse
+
+def parse_shard(text):
+    """"i/N" (1 <= i <= N) as (i, N), for --shard."""
+    index, _, count = text.partition('/')
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/N, e.g. 1/4, not {text!r}") from None
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard {text} is out of range, i must be between 1 and N")
+    return index, count
+
+def shard_feeds(feed_configs, index, count):
+    """The configs in shard index (1-based) of count, by a stable hash of their URL.
+
+    Feeds sharing a page always land in the same shard, so it is still fetched once,
+    and a feed stays in its shard when others are added to or removed from the catalogue.
+    """
+    return [feed_config for feed_config in feed_configs
+            if zlib.crc32(feed_config.url.encode('utf-8')) % count == index - 1]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="rssonceaday",
+                                     description="Generate RSS/JSON feeds from the configs in a feed catalogue.")
+    parser.add_argument("--catalogue", metavar="PATH", default=DEFAULT_CATALOGUE,
+                        help=f"read the feed configs from a .py, .json or .yaml file (default: ./{DEFAULT_CATALOGUE})")
+    parser.add_argument("--feed", action="append", metavar="NAME", dest="feeds",
+                        help="only build the feed whose output directory is NAME (repeatable)")
+    parser.add_argument("--only", metavar="GLOB",
+                        help="only build feeds whose output directory name matches GLOB, e.g. 'wiki*'")
+    parser.add_argument("--no-git", action="store_true", help="don't commit the changes to git")
+    parser.add_argument("--daemon", action="store_true",
+                        help="stay resident and refresh each feed on its own \"refresh_interval\"")
+    parser.add_argument("--workers", type=_count(1), default=DEFAULT_MAX_WORKERS,
+                        help="maximum concurrent downloads (1 runs serially)")
+    parser.add_argument("--per-host", type=_count(1), default=DEFAULT_MAX_PER_HOST,
+                        help="maximum concurrent downloads per host")
+    parser.add_argument("--processes", type=_count(0), default=1,
+                        help="parse and build feeds in N worker processes (0 for one per CPU)")
+    parser.add_argument("--shard", type=parse_shard, metavar="I/N",
+                        help="only build shard I of N of the selected feeds, e.g. to split them across machines")
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild every feed even if the page or selected content is unchanged")
+    parser.add_argument("--parser", choices=PARSER_BACKENDS, default=DEFAULT_PARSER,
+                        help="HTML parser backend for feeds without a \"parser\" key")
+    parser.add_argument("--report", metavar="PATH",
+                        help="write per-feed and per-stage timings to PATH (.json or .csv)")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="run under cProfile and dump the stats to PATH")
+    parser.add_argument("--log-format", choices=LOG_FORMATS, default="text",
+                        help="plain text or one JSON object per line")
+    parser.add_argument("--log-level", choices=("DEBUG", "INFO", "WARNING", "ERROR"), default="INFO",
+                        help="verbosity for feeds without a \"log_level\" key")
+    parser.add_argument("--log-file", metavar="PATH", default=DEFAULT_LOG_FILE,
+                        help="size-bounded, rotating log file ('' to log to the console only)")
+    parser.add_argument("--summary", action="store_true",
+                        help="only log warnings, errors and a per-feed summary at the end of the run")
+    parser.add_argument("--last-entries", action="store_true",
+                        help="log the last 3 entries of every feed that was built")
+    return parser.parse_args(argv)
+
+def run_daemon(feed_configs, args):
+    """Refresh feeds on their own schedules until SIGTERM/SIGINT."""
+    import signal
+    from .scheduler import run_scheduler
+
+    stop_event = threading.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_: stop_event.set())
+
+    # One pool for the daemon's lifetime: workers start once and keep their warm state between batches
+    processes = min(args.processes or os.cpu_count(), len(group_feeds_by_url(feed_configs)))
+    with ExitStack() as stack:
+        process_pool = stack.enter_context(worker_pool(processes)) if processes > 1 else None
+
+        def run_batch(batch):
+            started = time.perf_counter()
+            results = generate_feeds(batch, should_print_last_entries=args.last_entries,
+                                     max_workers=args.workers, max_per_host=args.per_host, force=args.force,
+                                     default_parser=args.parser, process_pool=process_pool)
+            if not args.no_git:
+                report_git_changes(changed_files(results))
+            log_summary(results, time.perf_counter() - started)
+            return results
+
+        logging.info(f"Daemon started for {len(feed_configs)} feeds")
+        run_scheduler(feed_configs, run_batch, stop_event=stop_event)
+    logging.info("Daemon stopped")
+
+def main(argv=None):
+    args = parse_args(argv)
+    error = None
+    try:
+        catalogue = load_catalogue(args.catalogue)
+    except (ConfigError, OSError, ValueError, SyntaxError, ImportError) as e:  # a .py catalogue may fail to run
+        catalogue, error = [], e
+
+    setup_logging(args.log_format, args.log_level, args.log_file, summary=args.summary, feed_configs=catalogue)
+    if error:
+        logging.error(f"Could not load the feed catalogue: {error}")
+        return 1
+    feed_configs = select_feeds(catalogue, names=args.feeds, pattern=args.only)
+    if not feed_configs:
+        logging.error("No feeds selected.")
+        return 1
+    if args.shard:
+        feed_configs = shard_feeds(feed_configs, *args.shard)
+        logging.info(f"Shard {args.shard[0]}/{args.shard[1]}: {len(feed_configs)} feeds")
+        if not feed_configs:
+            return 0  # other shards have them
+    if args.report:
+        start_report()
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+    try:
+        if profiler:
+            profiler.enable()
+        if args.daemon:
+            run_daemon(feed_configs, args)
+            return 0
+        started = time.perf_counter()
+        results = generate_feeds(feed_configs, should_print_last_entries=args.last_entries,
+                                 max_workers=args.workers, max_per_host=args.per_host, force=args.force,
+                                 default_parser=args.parser, processes=args.processes or os.cpu_count())
+        if not args.no_git:
+            report_git_changes(changed_files(results))
+        log_summary(results, time.perf_counter() - started)
+    except Exception as e:
+        logging.error(f"Main execution failed: {e}")
+        return 1
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            logging.info(f"Profile written to '{args.profile}'")
+        report = stop_report()
+        if report:
+            report.write(args.report)
+            logging.info(f"Run report written to '{args.report}'")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""Logging for CLI and daemon runs: text or JSON lines, per-feed verbosity, bounded files.
+
+The console gets the plain messages; the log file (logs/rssonceaday.log by
+default, kept out of feeds/ and out of git) rotates at LOG_MAX_BYTES so it
+stays bounded however many feeds or runs it sees. In JSON mode every record is
+one object per line with its time, level, feed and message.
+
+A feed config may set "log_level" (e.g. "WARNING" to quieten a chatty feed,
+"DEBUG" to trace one) for the records logged while that feed is being built.
+Summary mode logs only warnings, errors and the end-of-run summary.
+
+Worker processes (generate_feeds(..., processes=N)) filter their records the
+same way and send them over a queue to the parent, whose handlers write them;
+worker_logging() sets that up.
+"""
+import contextvars
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+DEFAULT_LOG_FILE = os.path.join("logs", "rssonceaday.log")
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUP_COUNT = 3
+LOG_FORMATS = ("text", "json")
+
+SUMMARY_LOGGER = "rssonceaday.summary"
+
+_current_feed = contextvars.ContextVar("current_feed", default=None)
+
+class FeedFilter(logging.Filter):
+    """Tag records with the feed being built and apply that feed's own log_level."""
+
+    def __init__(self, level):
+        super().__init__()
+        self.level = level
+
+    def filter(self, record):
+        if getattr(record, "forwarded", False):
+            return True  # already tagged and filtered in the worker process that logged it
+        feed = _current_feed.get()
+        record.feed = feed[0] if feed else None
+        if record.name == SUMMARY_LOGGER:
+            return True
+        level = feed[1] if feed and feed[1] is not None else self.level
+        return record.levelno >= level
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with any extra "fields" merged in."""
+
+    def format(self, record):
+        line = {
+            "time": time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "feed": getattr(record, "feed", None),
+            "message": record.getMessage().strip(),
+        }
+        line.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            line["exception"] = self.formatException(record.exc_info)
+        return json.dumps(line, ensure_ascii=False)
+
+def feed_level(feed_config):
+    """The numeric log_level of a feed config, or None if it doesn't set one."""
+    name = feed_config.log_level
+    if not name:
+        return None
+    level = logging.getLevelName(str(name).upper())
+    return level if isinstance(level, int) else None
+
+@contextmanager
+def feed_logging(feed_config):
+    """Attribute the records logged in the block to feed_config, at its log_level."""
+    token = _current_feed.set((feed_config.name, feed_level(feed_config)))
+    try:
+        yield
+    finally:
+        _current_feed.reset(token)
+
+def setup_logging(log_format="text", level="INFO", log_file=DEFAULT_LOG_FILE, summary=False, feed_configs=()):
+    """Configure the root logger for a run; an empty log_file logs to the console only."""
+    threshold = logging.WARNING if summary else logging.getLevelName(level.upper())
+    # Loggers must let through the most verbose level any feed asks for; FeedFilter narrows it per record
+    feed_levels = [] if summary else [lvl for lvl in map(feed_level, feed_configs) if lvl is not None]
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    root.setLevel(min([threshold] + feed_levels))
+    logging.getLogger(SUMMARY_LOGGER).setLevel(logging.INFO)
+
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        os.makedirs(os.path.dirname(log_file) or '.', exist_ok=True)
+        handlers.append(RotatingFileHandler(log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT,
+                                            encoding='utf-8'))
+    for handler in handlers:
+        if log_format == "json":
+            handler.setFormatter(JsonFormatter())
+        elif handler is not handlers[0]:
+            handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+        handler.addFilter(FeedFilter(threshold))
+        root.addHandler(handler)
+
+def _mark_forwarded(record):
+    record.forwarded = True
+    return True
+
+def _init_worker_logging(queue, level, threshold):
+    """Process pool initializer: send this worker's records to the parent's queue."""
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    root.setLevel(level)
+    logging.getLogger(SUMMARY_LOGGER).setLevel(logging.INFO)
+    handler = QueueHandler(queue)
+    handler.addFilter(FeedFilter(threshold))
+    handler.addFilter(_mark_forwarded)
+    root.addHandler(handler)
+
+class _ParentLoggers:
+    """QueueListener target that hands each forwarded record to the logger it came from."""
+
+    def handle(self, record):
+        logging.getLogger(record.name).handle(record)
+
+@contextmanager
+def worker_logging(mp_context):
+    """Yield (initializer, initargs) for a process pool whose workers log through this process's handlers."""
+    root = logging.getLogger()
+    thresholds = [f.level for handler in root.handlers for f in handler.filters if isinstance(f, FeedFilter)]
+    threshold = thresholds[0] if thresholds else root.getEffectiveLevel()
+    queue = mp_context.Queue()
+    listener = QueueListener(queue, _ParentLoggers())
+    listener.start()
+    try:
+        yield _init_worker_logging, (queue, root.getEffectiveLevel(), threshold)
+    finally:
+        listener.stop()
+
+def log_summary(results, seconds):
+    """One line per feed plus the run totals, logged in every mode."""
+    summary = logging.getLogger(SUMMARY_LOGGER)
+    counts = {}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+        summary.info(f"{result['name']}: {result['status']}, {len(result['written'])} files written",
+                     extra={"fields": {"status": result["status"], "written": len(result["written"]),
+                                       "entries": result["entries"], "feed": result["name"]}})
+    totals = ", ".join(f"{count} {status}" for status, count in counts.items())
+    summary.info(f"✅ {len(results)} feeds in {seconds:.1f}s: {totals}",
+                 extra={"fields": dict(counts, feeds=len(results), seconds=round(seconds, 3))})
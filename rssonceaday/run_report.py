@@ -0,0 +1,107 @@
+"""Per-run timing and metrics, written as a JSON or CSV report.
+
+start_report() activates a RunReport for the current run; stage() and note()
+are no-ops when no report is active, so library callers pay nothing for them.
+Records are keyed by page URL (fetch/parse), by feed output_path (selection,
+entry building, history, writes) or by "git".
+"""
+import csv
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+_active = None
+
+class RunReport:
+    def __init__(self):
+        self.started = time.time()
+        self.records = {}
+        self._lock = threading.Lock()
+
+    def _record(self, key):
+        record = self.records.get(key)
+        if record is None:
+            record = self.records[key] = {"stages": {}}
+        return record
+
+    def add_time(self, key, name, seconds):
+        with self._lock:
+            stages = self._record(key)["stages"]
+            stages[name] = stages.get(name, 0.0) + seconds
+
+    def note(self, key, **fields):
+        with self._lock:
+            self._record(key).update(fields)
+
+    def merge(self, records):
+        """Fold in the records of another report, e.g. one kept by a worker process."""
+        for key, record in records.items():
+            for name, seconds in record["stages"].items():
+                self.add_time(key, name, seconds)
+            self.note(key, **{field: value for field, value in record.items() if field != "stages"})
+
+    def as_dict(self):
+        with self._lock:
+            records = {key: dict(record, total=sum(record["stages"].values()))
+                       for key, record in self.records.items()}
+        return {"started": self.started, "duration": time.time() - self.started, "records": records}
+
+    def write(self, path):
+        """Write the report as CSV if path ends in .csv, otherwise as JSON."""
+        report = self.as_dict()
+        if not path.endswith('.csv'):
+            with open(path, 'w') as report_file:
+                json.dump(report, report_file, indent=4)
+            return
+        extra = sorted({field for record in report["records"].values() for field in record}
+                       - {"stages", "total"})
+        with open(path, 'w', newline='') as report_file:
+            writer = csv.writer(report_file)
+            writer.writerow(["key", "stage", "seconds"] + extra)
+            for key, record in report["records"].items():
+                values = [record.get(field, "") for field in extra]
+                for name, seconds in record["stages"].items():
+                    writer.writerow([key, name, f"{seconds:.6f}"] + values)
+                writer.writerow([key, "total", f"{record['total']:.6f}"] + values)
+
+def start_report():
+    global _active
+    _active = RunReport()
+    return _active
+
+def stop_report():
+    global _active
+    report, _active = _active, None
+    return report
+
+def report_active():
+    return _active is not None
+
+@contextmanager
+def stage(key, name):
+    """Time the enclosed block as stage name of key in the active report."""
+    report = _active
+    if report is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        report.add_time(key, name, time.perf_counter() - start)
+
+def add_time(key, name, seconds):
+    report = _active
+    if report is not None:
+        report.add_time(key, name, seconds)
+
+def note(key, **fields):
+    report = _active
+    if report is not None:
+        report.note(key, **fields)
+
+def merge_records(records):
+    report = _active
+    if report is not None and records:
+        report.merge(records)
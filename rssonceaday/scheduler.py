@@ -0,0 +1,89 @@
+"""Resident scheduler: refresh each feed on its own interval in one long-lived process.
+
+Each config may set "refresh_interval" (seconds, or a string such as "30m",
+"1h", "7d"; default one day) and "refresh_jitter" (a fraction of the interval,
+default 0.1). Feeds that fail to fetch are retried with exponential backoff,
+starting at RETRY_BASE seconds and capped at their normal interval. Feeds are
+scheduled per source URL, at the shortest interval among the feeds sharing it,
+so a shared page is still fetched once; groups that come due together run as
+one batch.
+The process keeps compiled selectors and loaded entry stores warm between runs.
+"""
+import heapq
+import logging
+import random
+import threading
+import time
+
+DEFAULT_REFRESH_INTERVAL = "1d"
+DEFAULT_JITTER = 0.1
+RETRY_BASE = 300  # seconds before the first retry of a failed feed
+
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+def parse_interval(value):
+    """Seconds for 3600, "3600", "90s", "30m", "1h", "1.5d" or "1w"."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip().lower()
+    if text and text[-1] in _UNITS:
+        return float(text[:-1]) * _UNITS[text[-1]]
+    return float(text)
+
+def next_delay(url_configs, failures=0, rng=random):
+    """Seconds until the feeds of one URL should run again, after `failures` consecutive failures.
+
+    The group runs at its shortest refresh_interval with a single jitter draw, so
+    feeds sharing a page stay in the same batch and the page is fetched once.
+    """
+    interval = min(feed_config.refresh_interval for feed_config in url_configs)  # seconds, parsed at load
+    delay = min(interval, RETRY_BASE * 2 ** (failures - 1)) if failures else interval
+    jitter = min(feed_config.refresh_jitter for feed_config in url_configs)
+    return max(0.0, delay * (1 + rng.uniform(-jitter, jitter)))
+
+def run_scheduler(feed_configs, run_batch, stop_event=None, clock=time.monotonic, max_batches=None, rng=random):
+    """Run due feeds through run_batch(configs) -> results until stop_event is set.
+
+    Feeds are scheduled per source URL. run_batch must return one result dict
+    per config, in order; a "fetch_failed" status counts as a failure of the
+    URL for backoff. Every feed runs once at start-up.
+    """
+    stop_event = stop_event or threading.Event()
+    groups = {}
+    for index, feed_config in enumerate(feed_configs):
+        groups.setdefault(feed_config.url, []).append(index)
+    groups = list(groups.values())
+    failures = [0] * len(groups)
+    queue = [(clock(), group) for group in range(len(groups))]
+    heapq.heapify(queue)
+    batches = 0
+    while queue and not stop_event.is_set():
+        wait = queue[0][0] - clock()
+        if wait > 0:
+            stop_event.wait(wait)
+            continue
+        now = clock()
+        due = []
+        while queue and queue[0][0] <= now:
+            due.append(heapq.heappop(queue)[1])
+        indexes = sorted(index for group in due for index in groups[group])  # keep config order inside a batch
+        logging.info(f"Scheduler: running {len(indexes)} due feed(s)")
+        try:
+            results = run_batch([feed_configs[index] for index in indexes])
+        except Exception as e:
+            logging.error(f"Scheduler batch failed: {e}")
+            results = [{"status": "fetch_failed"}] * len(indexes)
+        statuses = {index: result["status"] for index, result in zip(indexes, results)}
+        for group in due:
+            failed = any(statuses.get(index) == "fetch_failed" for index in groups[group])
+            failures[group] = failures[group] + 1 if failed else 0
+            url_configs = [feed_configs[index] for index in groups[group]]
+            delay = next_delay(url_configs, failures[group], rng)
+            heapq.heappush(queue, (clock() + delay, group))
+            if failures[group]:
+                logging.info(f"Scheduler: {url_configs[0].url} failed {failures[group]} time(s), "
+                             f"retrying in {delay:.0f}s")
+        batches += 1
+        if max_batches is not None and batches >= max_batches:
+            break
+        logging.info(f"Scheduler: next run in {max(0.0, queue[0][0] - clock()):.0f}s")
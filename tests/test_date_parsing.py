@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from rssonceaday.date_parsing import parse_date
+
+BRT = timezone(timedelta(hours=-3))
+
+@pytest.mark.parametrize("text, fmt", [
+    ("22 de agosto de 2026", "%d de %B de %Y"),
+    ("22 de Agosto de 2026", "%d de %B de %Y"),
+    ("22 ago 2026", "%d %b %Y"),
+    ("Sábado, 22 de agosto de 2026", "%A, %d de %B de %Y"),
+    ("sábado, 22 de agosto de 2026", "%A, %d de %B de %Y"),
+    ("Sáb, 22/08/2026", "%a, %d/%m/%Y"),
+    ("Saturday, 22 August 2026", "%A, %d %B %Y"),
+])
+def test_month_and_weekday_names(text, fmt):
+    assert parse_date(text, fmt, "GMT-3") == datetime(2026, 8, 22, tzinfo=BRT)
+
+def test_month_name_with_accent():
+    assert parse_date("10 de Março de 2026", "%d de %B de %Y") == datetime(2026, 3, 10, tzinfo=timezone.utc)
+
+@pytest.mark.parametrize("text", ["1º de março de 2026", "1° de março de 2026", "1 de março de 2026"])
+def test_ordinal_day(text):
+    assert parse_date(text, "%d de %B de %Y") == datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+@pytest.mark.parametrize("text", ["Palavra de Hoje (22/08/2026)", "22/08/2026 - Palavra de Hoje"])
+def test_date_inside_text(text):
+    assert parse_date(text, "%d/%m/%Y", "America/Sao_Paulo") == datetime(2026, 8, 22, tzinfo=BRT)
+
+def test_first_date_wins():
+    assert parse_date("21/08/2026 ou 22/08/2026", "%d/%m/%Y") == datetime(2026, 8, 21, tzinfo=timezone.utc)
+
+@pytest.mark.parametrize("text, fmt", [
+    ("Palavra de Hoje", "%d/%m/%Y"),
+    ("31/02/2026", "%d/%m/%Y"),
+    ("22 de agosto de 2026", ""),
+    ("", "%d/%m/%Y"),
+])
+def test_no_date(text, fmt):
+    assert parse_date(text, fmt) is None
+
+def test_unsupported_directive():
+    with pytest.raises(ValueError):
+        parse_date("2026-234", "%Y-%j")
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta, timezone
+
+from rssonceaday.entry_store import (FIRST_SEEN, UPDATED, evict_entries, feed_updated, merge_entries, newest_first,
+                                     output_record)
+
+DAY_ONE = datetime(2026, 8, 21, 12, tzinfo=timezone.utc)
+DAY_TWO = DAY_ONE + timedelta(days=1)
+
+def page(*ids):
+    """Page entries in page order (newest first)."""
+    return [{"ID": entry_id, "Title": f"Title {entry_id}"} for entry_id in ids]
+
+def ids(store):
+    return [entry["ID"] for entry in newest_first(store)]
+
+def test_merge_keeps_page_order_newest_first():
+    store = {}
+    assert merge_entries(store, page("c", "b", "a"), now=DAY_ONE) == 3
+    assert ids(store) == ["c", "b", "a"]
+    assert list(store) == ["a", "b", "c"]  # stored oldest to newest
+
+def test_merge_adds_new_entries_on_top():
+    store = {}
+    merge_entries(store, page("b", "a"), now=DAY_ONE)
+    assert merge_entries(store, page("d", "c", "b"), now=DAY_TWO) == 2
+    assert ids(store) == ["d", "c", "b", "a"]
+
+def test_merge_keeps_first_seen_and_bumps_updated_only_on_change():
+    store = {}
+    merge_entries(store, page("a", "b"), now=DAY_ONE)
+    changed = [{"ID": "a", "Title": "New title"}, {"ID": "b", "Title": "Title b"}]
+    assert merge_entries(store, changed, now=DAY_TWO) == 0
+    assert store["a"][FIRST_SEEN] == store["b"][FIRST_SEEN] == "2026-08-21T12:00:00Z"
+    assert store["a"][UPDATED] == "2026-08-22T12:00:00Z"
+    assert store["b"][UPDATED] == "2026-08-21T12:00:00Z"
+    assert output_record(store["a"]) == {"ID": "a", "Title": "New title"}
+    assert feed_updated(store) == "2026-08-22T12:00:00Z"
+
+def test_evict_by_count_drops_oldest():
+    store = {}
+    merge_entries(store, page("e", "d", "c", "b", "a"), now=DAY_ONE)
+    assert evict_entries(store, max_entries=3) == 2
+    assert ids(store) == ["e", "d", "c"]
+
+def test_evict_by_age():
+    store = {}
+    merge_entries(store, page("a"), now=DAY_ONE)
+    merge_entries(store, page("b"), now=DAY_ONE + timedelta(days=10))
+    now = DAY_ONE + timedelta(days=12)
+    assert evict_entries(store, max_entries=None, max_age_days=5, now=now) == 1
+    assert ids(store) == ["b"]
+
+def test_evict_without_limits_keeps_everything():
+    store = {}
+    merge_entries(store, page("b", "a"), now=DAY_ONE)
+    assert evict_entries(store, max_entries=None, max_age_days=None) == 0
+    assert ids(store) == ["b", "a"]
@@ -0,0 +1,44 @@
+import dataclasses
+
+import pytest
+
+from rssonceaday.extraction import FieldSpec
+from rssonceaday.feed_config import ConfigError, as_feed_config
+
+ITEM_SCOPED = {
+    "url": "https://example.com/page", "output_path": "feeds/word", "title": "Word",
+    "item_css": ".item",
+    "fields": {"title": ".title", "link": "a", "extras": {"css": ".extra", "all": True}},
+}
+LEGACY = {"url": "https://example.com/page", "output_path": "feeds/legacy", "title": "Legacy",
+          "item_title_css": " h2 ", "item_url_css": "h2 a"}
+
+def test_fields_are_normalised_in_order():
+    config = as_feed_config(ITEM_SCOPED)
+    assert config.fields == (("title", FieldSpec(".title", None, False)), ("link", FieldSpec("a", "href", False)),
+                             ("extras", FieldSpec(".extra", None, True)))
+
+def test_legacy_fields():
+    assert as_feed_config(LEGACY).legacy_fields == (("title", "h2"), ("link", "h2 a"))
+
+@pytest.mark.parametrize("raw", [ITEM_SCOPED, LEGACY])
+def test_config_is_frozen_and_hashable(raw):
+    config = as_feed_config(raw)
+    assert hash(config) == hash(as_feed_config(raw))
+    assert {config: 1}[as_feed_config(raw)] == 1
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.title = "Other"
+
+def test_as_dict_keeps_mappings():
+    values = as_feed_config(ITEM_SCOPED).as_dict()
+    assert values["fields"]["extras"] == {"css": ".extra", "attr": None, "all": True}
+    assert as_feed_config(LEGACY).as_dict()["legacy_fields"] == {"title": "h2", "link": "h2 a"}
+
+@pytest.mark.parametrize("changes, problem", [
+    ({"refresh_interval": 0}, "refresh_interval must be greater than 0"),
+    ({"fields": {"link": "a"}}, "item_css needs a fields mapping with a title"),
+    ({"formats": ["atom", "nope"]}, "unknown formats ['nope']"),
+])
+def test_invalid_config(changes, problem):
+    with pytest.raises(ConfigError, match=problem.replace("[", r"\[")):
+        as_feed_config(dict(ITEM_SCOPED, **changes))
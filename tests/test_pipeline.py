@@ -0,0 +1,57 @@
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import pytest
+
+from rssonceaday import pipeline
+from rssonceaday.feed_config import as_feed_config
+
+def config(name, url):
+    return as_feed_config({"url": url, "output_path": f"feeds/{name}", "title": name, "item_title_css": "h2"})
+
+@pytest.mark.parametrize("count", [1, 2, 3, 7])
+def test_shard_feeds_partitions_by_url(count):
+    configs = [config(f"feed{index}", f"https://example.com/page{index % 5}") for index in range(20)]
+    shards = [pipeline.shard_feeds(configs, index, count) for index in range(1, count + 1)]
+    assert sorted(c.name for shard in shards for c in shard) == sorted(c.name for c in configs)
+    for url in {c.url for c in configs}:
+        assert sum(any(c.url == url for c in shard) for shard in shards) == 1
+
+def test_shard_feeds_is_stable():
+    configs = [config(f"feed{index}", f"https://example.com/page{index}") for index in range(20)]
+    first = [c.name for c in pipeline.shard_feeds(configs, 2, 4)]
+    assert [c.name for c in pipeline.shard_feeds(configs[:10], 2, 4)] == [name for name in first
+                                                                          if int(name[4:]) < 10]
+
+def test_start_downloads_caps_requests_per_host(monkeypatch):
+    lock = threading.Lock()
+    running = Counter()
+    peak = Counter()
+
+    def download(url, headers=None, options=None):
+        host = urlsplit(url).hostname
+        with lock:
+            running[host] += 1
+            peak[host] = max(peak[host], running[host])
+        time.sleep(0.02)
+        with lock:
+            running[host] -= 1
+        return url
+
+    monkeypatch.setattr(pipeline, "_download", download)
+    urls = [f"https://slow.example/{index}" for index in range(6)]
+    urls += [f"https://fast.example/{index}" for index in range(3)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        pending = pipeline.start_downloads(urls, executor, max_per_host=2)
+        assert {url: future.result(timeout=5) for url, future in pending.items()} == {url: url for url in urls}
+    assert peak == {"slow.example": 2, "fast.example": 2}
+
+def test_start_downloads_treats_cap_below_one_as_one(monkeypatch):
+    monkeypatch.setattr(pipeline, "_download", lambda url, headers=None, options=None: url)
+    urls = [f"https://example.com/{index}" for index in range(3)]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        pending = pipeline.start_downloads(urls, executor, max_per_host=0)
+        assert [future.result(timeout=5) for future in pending.values()] == urls
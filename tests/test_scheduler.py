@@ -0,0 +1,36 @@
+import pytest
+
+from rssonceaday.feed_config import as_feed_config
+from rssonceaday.scheduler import RETRY_BASE, next_delay, parse_interval
+
+class NoJitter:
+    def uniform(self, low, high):
+        return 0.0
+
+class MaxJitter:
+    def uniform(self, low, high):
+        return high
+
+def config(name, interval="1d", jitter=0, url="https://example.com/page"):
+    return as_feed_config({"url": url, "output_path": f"feeds/{name}", "title": name, "item_title_css": "h2",
+                           "refresh_interval": interval, "refresh_jitter": jitter})
+
+@pytest.mark.parametrize("value, seconds", [(3600, 3600), ("3600", 3600), ("90s", 90), ("30m", 1800),
+                                            ("1h", 3600), ("1.5d", 129600), ("1w", 604800)])
+def test_parse_interval(value, seconds):
+    assert parse_interval(value) == seconds
+
+def test_next_delay_uses_interval_without_failures():
+    assert next_delay([config("a", "1h")], rng=NoJitter()) == 3600
+
+def test_next_delay_backs_off_exponentially():
+    configs = [config("a", "1d")]
+    delays = [next_delay(configs, failures, NoJitter()) for failures in range(1, 6)]
+    assert delays == [RETRY_BASE, RETRY_BASE * 2, RETRY_BASE * 4, RETRY_BASE * 8, RETRY_BASE * 16]
+
+def test_next_delay_backoff_is_capped_at_interval():
+    assert next_delay([config("a", "1h")], failures=10, rng=NoJitter()) == 3600
+
+def test_next_delay_group_uses_shortest_interval_and_jitter():
+    configs = [config("a", "1d", jitter=0.2), config("b", "2h", jitter=0.1)]
+    assert next_delay(configs, rng=MaxJitter()) == pytest.approx(7200 * 1.1)